@@ -0,0 +1,87 @@
+"""
+Benchmarks for the day 1 calibration solvers.
+
+Run from the repository root with:
+    python -m benchmarks.day_1
+"""
+import random
+from timeit import timeit
+
+import day_1
+
+NUM_LINES: int = 100_000
+ALPHABET: str = "abcdefghijklmnopqrstuvwxyz123456789"
+WORDS: [str] = list(day_1.CARDINAL_DIGITS)
+
+
+def generate_lines(num_lines: int = NUM_LINES, seed: int = 0) -> [str]:
+    """
+    Generates random calibration lines mixing letters, digits and spelled-out digits.
+
+    Args:
+        num_lines (int, optional): The number of lines to generate. Defaults to NUM_LINES.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        list[str]: The generated lines.
+    """
+    rng: random.Random = random.Random(seed)
+    lines: [str] = []
+    for _ in range(num_lines):
+        parts: [str] = [
+            rng.choice(WORDS) if rng.random() < 0.2 else rng.choice(ALPHABET)
+            for _ in range(rng.randint(5, 40))
+        ]
+        lines.append("".join(parts) + rng.choice("123456789"))
+    return lines
+
+
+def get_calibration_value_by_character(lines: [str], include_cardinal_digits: bool = False) -> int:
+    """
+    The per-character calibration solver the automaton replaced.
+    """
+    return sum(
+        day_1.get_first_matching_digit(line, False, include_cardinal_digits) * 10
+        + day_1.get_first_matching_digit(line, True, include_cardinal_digits)
+        for line in lines
+    )
+
+
+def get_calibration_value_by_automaton(lines: [str], include_cardinal_digits: bool = False) -> int:
+    """
+    Scans each line from both ends with the precompiled automata.
+    """
+    automaton: day_1.DigitAutomaton = day_1.get_digit_automaton(include_cardinal_digits)
+    return sum(automaton.first(line) * 10 + automaton.last(line) for line in lines)
+
+
+def get_calibration_value_by_single_pass(lines: [str], include_cardinal_digits: bool = False) -> int:
+    """
+    Scans each line once, left to right, with the forward automaton.
+    """
+    automaton: day_1.DigitAutomaton = day_1.get_digit_automaton(include_cardinal_digits)
+    total: int = 0
+    for line in lines:
+        first, last = automaton.first_and_last(line)
+        total += first * 10 + last
+    return total
+
+
+if __name__ == "__main__":
+    lines: [str] = generate_lines()
+    buffer: bytes = "\n".join(lines).encode()
+
+    for include_cardinal_digits in (False, True):
+        expected: int = get_calibration_value_by_character(lines, include_cardinal_digits)
+        print(f"{include_cardinal_digits=}")
+
+        solvers: dict = {
+            "by_character": lambda: get_calibration_value_by_character(lines, include_cardinal_digits),
+            "by_automaton": lambda: get_calibration_value_by_automaton(lines, include_cardinal_digits),
+            "by_single_pass": lambda: get_calibration_value_by_single_pass(lines, include_cardinal_digits),
+            "by_bulk_buffer": lambda: day_1.get_bulk_calibration_value(buffer, include_cardinal_digits),
+        }
+        for name, solver in solvers.items():
+            assert solver() == expected
+            seconds: float = timeit(solver, number=3) / 3
+            print(f"\t{name:20} {seconds:8.3f}s  {len(lines) / seconds:12,.0f} lines/s")
@@ -0,0 +1,79 @@
+"""
+Benchmarks for the day 2 bag configuration queries.
+
+Run from the repository root with:
+    python -m benchmarks.day_2
+"""
+import random
+from timeit import timeit
+
+import day_2
+
+NUM_GAMES: int = 20_000
+NUM_QUERIES: int = 1_000
+MAX_BALLS: int = 20
+
+
+def generate_lines(num_games: int = NUM_GAMES, seed: int = 0) -> [str]:
+    """
+    Generates random game lines.
+
+    Args:
+        num_games (int, optional): The number of games to generate. Defaults to NUM_GAMES.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        list[str]: The generated lines.
+    """
+    rng: random.Random = random.Random(seed)
+    lines: [str] = []
+    for game_id in range(1, num_games + 1):
+        draws: [str] = []
+        for _ in range(rng.randint(1, 6)):
+            colors: [str] = rng.sample(list(day_2.COLOR_INDEX), rng.randint(1, 3))
+            draws.append(", ".join(f"{rng.randint(1, MAX_BALLS)} {color}" for color in colors))
+        lines.append(f"Game {game_id}: " + "; ".join(draws))
+    return lines
+
+
+def generate_thresholds(num_queries: int = NUM_QUERIES, seed: int = 1) -> [tuple[int, int, int]]:
+    """
+    Generates random (max_red, max_green, max_blue) bag configurations.
+
+    Args:
+        num_queries (int, optional): The number of configurations to generate. Defaults to NUM_QUERIES.
+        seed (int, optional): The random seed. Defaults to 1.
+
+    Returns:
+        list[tuple[int, int, int]]: The generated configurations.
+    """
+    rng: random.Random = random.Random(seed)
+    return [
+        tuple(rng.randint(0, MAX_BALLS) for _ in range(day_2.NUM_COLORS))
+        for _ in range(num_queries)
+    ]
+
+
+if __name__ == "__main__":
+    lines: [str] = generate_lines()
+    thresholds: [tuple[int, int, int]] = generate_thresholds()
+
+    games: [dict] = [day_2.parse_line(line) for line in lines]
+    store: day_2.GameStore = day_2.GameStore.from_lines(lines)
+
+    seconds: float = timeit(lambda: day_2.ThresholdIndex.from_lines(lines), number=1)
+    print(f"{'index build':30} {seconds:8.3f}s")
+
+    index: day_2.ThresholdIndex = day_2.ThresholdIndex.from_lines(lines)
+    expected: [int] = [day_2.get_games_checksum_and_power(games, *threshold)[0] for threshold in thresholds[:20]]
+    assert index.get_checksums(thresholds[:20]) == expected
+
+    solvers: dict = {
+        "get_games_checksum_and_power": lambda threshold: day_2.get_games_checksum_and_power(games, *threshold),
+        "GameStore": lambda threshold: day_2.get_games_checksum_and_power(store, *threshold),
+        "ThresholdIndex": lambda threshold: index.get_checksum(*threshold),
+    }
+    for name, solver in solvers.items():
+        queries: [tuple[int, int, int]] = thresholds if name == "ThresholdIndex" else thresholds[:20]
+        seconds: float = timeit(lambda: [solver(threshold) for threshold in queries], number=1)
+        print(f"{name:30} {len(queries) / seconds:14,.0f} queries/s")
@@ -0,0 +1,54 @@
+"""
+Benchmarks for the day 3 schematic backends.
+
+Run from the repository root with:
+    python -m benchmarks.day_3 [size]
+
+The grid backend is only timed on schematics of up to GRID_MAX_SIZE cells per side.
+"""
+import random
+import sys
+from timeit import timeit
+
+import day_3
+
+SIZE: int = 10_000
+GRID_MAX_SIZE: int = 1_000
+# Byte values are mapped onto mostly ".", some digits and a few symbols
+CELL_TABLE: bytes = bytes(
+    ("." * 160 + "0123456789" * 9 + "*#+$%&")[byte % 256].encode()[0] for byte in range(256)
+)
+
+
+def generate_lines(size: int = SIZE, seed: int = 0) -> [str]:
+    """
+    Generates a random square schematic.
+
+    Args:
+        size (int, optional): The number of rows and columns. Defaults to SIZE.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        list[str]: The rows of the schematic.
+    """
+    rng: random.Random = random.Random(seed)
+    return [rng.randbytes(size).translate(CELL_TABLE).decode() for _ in range(size)]
+
+
+if __name__ == "__main__":
+    size: int = int(sys.argv[1]) if len(sys.argv) > 1 else SIZE
+    lines: [str] = generate_lines(size)
+
+    for include_all_symbols in (True, False):
+        print(f"{size}x{size} {include_all_symbols=}")
+        backends: [str] = day_3.BACKENDS if size <= GRID_MAX_SIZE else ("bitset",)
+
+        results: dict[str, int] = {}
+        for backend in backends:
+            seconds: float = timeit(
+                lambda: results.setdefault(backend, day_3.get_checksum(lines, include_all_symbols, backend=backend)),
+                number=1,
+            )
+            print(f"\t{backend:10} {seconds:8.3f}s  {size * size / seconds:14,.0f} cells/s")
+
+        assert len(set(results.values())) == 1
@@ -0,0 +1,79 @@
+"""
+Benchmarks for the day 4 card parsers.
+
+Run from the repository root with:
+    python -m benchmarks.day_4 [num_cards]
+"""
+import random
+import sys
+from timeit import timeit
+
+import day_4
+
+NUM_CARDS: int = 1_000_000
+NUM_WINNING: int = 10
+NUM_PLAYED: int = 25
+# The line-based parsers are timed batch by batch so their objects never all live at once
+BATCH_SIZE: int = 100_000
+
+
+def generate_buffer(num_cards: int = NUM_CARDS, seed: int = 0) -> bytes:
+    """
+    Generates random card lines formatted like the puzzle input.
+
+    Args:
+        num_cards (int, optional): The number of cards to generate. Defaults to NUM_CARDS.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        bytes: The generated lines.
+    """
+    rng: random.Random = random.Random(seed)
+    width: int = len(str(num_cards))
+    lines: [str] = []
+    for card_id in range(1, num_cards + 1):
+        numbers: [int] = rng.sample(range(1, 100), NUM_WINNING + NUM_PLAYED)
+        winning: str = " ".join(f"{num:2}" for num in numbers[:NUM_WINNING])
+        played: str = " ".join(f"{num:2}" for num in rng.sample(numbers, NUM_PLAYED))
+        lines.append(f"Card {card_id:{width}}: {winning} | {played}")
+    return "\n".join(lines).encode()
+
+
+def tokenize(buffer: bytes) -> day_4.CardTokenizer:
+    """
+    Feeds the buffer to a CardTokenizer in 1 MiB chunks.
+    """
+    tokenizer: day_4.CardTokenizer = day_4.CardTokenizer()
+    for start in range(0, len(buffer), 1 << 20):
+        tokenizer.feed(buffer[start : start + (1 << 20)])
+    tokenizer.close()
+    return tokenizer
+
+
+def time_in_batches(parser, lines: [str], batch_size: int = BATCH_SIZE) -> float:
+    """
+    Times a line-based parser over the lines, one batch at a time.
+    """
+    return sum(
+        timeit(lambda: parser(lines[start : start + batch_size]), number=1)
+        for start in range(0, len(lines), batch_size)
+    )
+
+
+if __name__ == "__main__":
+    num_cards: int = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_CARDS
+    buffer: bytes = generate_buffer(num_cards)
+    lines: [str] = buffer.decode().split("\n")
+
+    sample: [day_4.Game] = day_4.extract_games(day_4.parse_input(lines[:10_000]))
+    assert list(tokenize(buffer).match_counts[:10_000]) == [game.number_winning_played_games for game in sample]
+
+    timings: dict[str, float] = {
+        "parse_input + extract_games": time_in_batches(
+            lambda batch: day_4.extract_games(day_4.parse_input(batch)), lines
+        ),
+        "extract_cards": time_in_batches(day_4.extract_cards, lines),
+        "CardTokenizer": timeit(lambda: tokenize(buffer), number=1),
+    }
+    for name, seconds in timings.items():
+        print(f"{name:30} {seconds:8.3f}s  {num_cards / seconds:12,.0f} cards/s")
@@ -0,0 +1,55 @@
+"""
+Benchmarks for the day 5 seed lookups.
+
+Run from the repository root with:
+    python -m benchmarks.day_5 [num_seeds]
+
+The per-seed SourceMap.__getitem__ path is only timed on the first GETITEM_SEEDS seeds.
+"""
+import random
+import sys
+from array import array
+from timeit import timeit
+
+import day_5
+from utils import utils
+
+NUM_SEEDS: int = 10_000_000
+GETITEM_SEEDS: int = 100_000
+
+
+def generate_seeds(num_seeds: int = NUM_SEEDS, seed: int = 0) -> array:
+    """
+    Generates random seed numbers in the range covered by the puzzle input.
+
+    Args:
+        num_seeds (int, optional): The number of seeds to generate. Defaults to NUM_SEEDS.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        array: The seeds, as an array("q").
+    """
+    rng: random.Random = random.Random(seed)
+    return array("q", array("I", rng.randbytes(4 * num_seeds)))
+
+
+if __name__ == "__main__":
+    num_seeds: int = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_SEEDS
+    _, source_map = day_5.parse_lines(utils.read_lines("day_5-data.txt"))
+    seeds: array = generate_seeds(num_seeds)
+
+    seconds: float = timeit(source_map.compile, number=1)
+    print(f"{'compile':20} {seconds:8.3f}s  {len(source_map.compile())} segments")
+    compiled_map: day_5.PiecewiseMap = source_map.compile()
+
+    sample: array = seeds[:GETITEM_SEEDS]
+    assert compiled_map.map_values(sample) == array("q", (source_map[seed] for seed in sample))
+
+    timings: dict[str, tuple[float, int]] = {
+        "SourceMap[seed]": (timeit(lambda: [source_map[seed] for seed in sample], number=1), len(sample)),
+        "PiecewiseMap[seed]": (timeit(lambda: [compiled_map[seed] for seed in seeds], number=1), len(seeds)),
+        "map_values": (timeit(lambda: compiled_map.map_values(seeds), number=1), len(seeds)),
+        "get_min_mapped_value": (timeit(lambda: compiled_map.get_min_mapped_value(seeds), number=1), len(seeds)),
+    }
+    for name, (seconds, count) in timings.items():
+        print(f"{name:20} {seconds:8.3f}s  {count / seconds:14,.0f} seeds/s")
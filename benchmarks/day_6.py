@@ -0,0 +1,64 @@
+"""
+Benchmarks for the day 6 race solvers.
+
+Run from the repository root with:
+    python -m benchmarks.day_6 [num_races]
+"""
+import random
+import sys
+from timeit import timeit
+
+import day_6
+
+NUM_RACES: int = 1_000_000
+MAX_TIME: int = 1_000_000
+# Races small enough to count winning hold times one by one
+NUM_BRUTE_FORCE_RACES: int = 10_000
+
+
+def generate_races(num_races: int = NUM_RACES, max_time: int = MAX_TIME, seed: int = 0) -> [[int], [int]]:
+    """
+    Generates random races whose records can be beaten.
+
+    Args:
+        num_races (int, optional): The number of races to generate. Defaults to NUM_RACES.
+        max_time (int, optional): The longest race time. Defaults to MAX_TIME.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        list[list[int], list[int]]: The times and record distances of the races.
+    """
+    rng: random.Random = random.Random(seed)
+    times: [int] = [rng.randint(1, max_time) for _ in range(num_races)]
+    # Keep records strictly below the peak so the float solver stays real-valued
+    distances: [int] = [rng.randint(0, max(time * time // 4 - 1, 0)) for time in times]
+    return times, distances
+
+
+if __name__ == "__main__":
+    num_races: int = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_RACES
+
+    # Cross-check against counting every hold time on small races
+    times, distances = generate_races(NUM_BRUTE_FORCE_RACES, max_time=100, seed=1)
+    expected: [int] = [
+        sum(hold * (time - hold) > distance for hold in range(time + 1))
+        for time, distance in zip(times, distances)
+    ]
+    assert day_6.get_win_window_widths(times, distances) == expected
+    for time, distance, width in zip(times, distances, expected):
+        min_bound, max_bound = day_6.calculate_exact_displacement_bounds(time, distance)
+        assert max_bound - min_bound + 1 == width
+
+    times, distances = generate_races(num_races)
+    solvers: dict = {
+        "calculate_displacement_bounds": lambda: [
+            day_6.calculate_displacement_bounds(time, distance) for time, distance in zip(times, distances)
+        ],
+        "calculate_exact_displacement_bounds": lambda: [
+            day_6.calculate_exact_displacement_bounds(time, distance) for time, distance in zip(times, distances)
+        ],
+        "get_win_window_widths": lambda: day_6.get_win_window_widths(times, distances),
+    }
+    for name, solver in solvers.items():
+        seconds: float = timeit(solver, number=1)
+        print(f"{name:40} {seconds:8.3f}s  {num_races / seconds:14,.0f} pairs/s")
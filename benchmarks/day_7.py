@@ -0,0 +1,77 @@
+"""
+Benchmarks for the day 7 hand ranking.
+
+Run from the repository root with:
+    python -m benchmarks.day_7 [num_hands]
+
+The original count-based ranking is only timed on the first COUNTING_HANDS hands,
+and sort_by_rank on the first SORTED_HANDS hands.
+"""
+import random
+import sys
+from timeit import timeit
+
+import day_7
+
+NUM_HANDS: int = 10_000_000
+COUNTING_HANDS: int = 100_000
+SORTED_HANDS: int = 1_000_000
+
+
+def generate_hands(num_hands: int = NUM_HANDS, seed: int = 0) -> [str]:
+    """
+    Generates random hands of cards.
+
+    Args:
+        num_hands (int, optional): The number of hands to generate. Defaults to NUM_HANDS.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        list[str]: The hands, e.g. "32T3K".
+    """
+    rng: random.Random = random.Random(seed)
+    cards: str = "".join(day_7.CARD_MAP)
+    return ["".join(rng.choices(cards, k=day_7.HAND_SIZE)) for _ in range(num_hands)]
+
+
+def get_counting_rank(hand: str, wildcard: bool = False) -> day_7.HandRank:
+    """
+    Ranks a hand by counting its cards, as day_7.get_hand_rank did before the lookup table.
+
+    Args:
+        hand (str): The hand of cards represented as a string.
+        wildcard (bool, optional): Indicates whether a wildcard is present. Defaults to False.
+
+    Returns:
+        HandRank: The rank of the hand.
+    """
+    card_counts: [int] = [0] * 13
+    for card in hand:
+        card_counts[day_7.get_card_value(card, wildcard)] += 1
+
+    return day_7.get_counts_rank(card_counts, wildcard)
+
+
+if __name__ == "__main__":
+    num_hands: int = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_HANDS
+    hands: [str] = generate_hands(num_hands)
+    sample: [str] = hands[:COUNTING_HANDS]
+
+    for wildcard in (False, True):
+        seconds: float = timeit(lambda: day_7.get_hand_type_table.__wrapped__(wildcard), number=1)
+        print(f"{'get_hand_type_table':20} {seconds:8.3f}s  {wildcard=}")
+
+        expected: bytes = bytes(get_counting_rank(hand, wildcard) for hand in sample)
+        assert day_7.get_hand_ranks(sample, wildcard) == expected
+
+        timings: dict[str, tuple[float, int]] = {
+            "counting": (timeit(lambda: [get_counting_rank(hand, wildcard) for hand in sample], number=1), len(sample)),
+            "get_hand_rank": (timeit(lambda: [day_7.get_hand_rank(hand, wildcard) for hand in hands], number=1), len(hands)),
+            "get_hand_ranks": (timeit(lambda: day_7.get_hand_ranks(hands, wildcard), number=1), len(hands)),
+        }
+        for name, (seconds, count) in timings.items():
+            print(f"{name:20} {seconds:8.3f}s  {count / seconds:14,.0f} hands/s  {wildcard=}")
+
+        plays: [tuple[str, int]] = [(hand, 1) for hand in hands[:SORTED_HANDS]]
+        seconds = timeit(lambda: day_7.sort_by_rank(plays, wildcard), number=1)
+        print(f"{'sort_by_rank':20} {seconds:8.3f}s  {len(plays) / seconds:14,.0f} hands/s  {wildcard=}")
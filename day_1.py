@@ -31,7 +31,30 @@ Your calculation isn't quite right. It looks like some of the digits are actuall
 
 Equipped with this new information, you now need to find the real first and last digit on each line. For example:
 """
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from utils import utils
+import os
+import re
+
+DIGITS: dict[str, int] = {str(digit): digit for digit in range(1, 10)}
+CARDINAL_DIGITS: dict[str, int] = dict(
+    zip(["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"], range(1, 10))
+)
+
+# Bytes removed from a buffer before bulk scanning (everything but 1-9 and newlines)
+NON_DIGIT_BYTES: bytes = bytes(byte for byte in range(256) if byte not in b"123456789\n")
+# Spelled-out digits keep their first and last letters, so overlaps such as "oneight" survive the substitution
+CARDINAL_DIGIT_SUBSTITUTIONS: [tuple[bytes, bytes]] = [
+    (word.encode(), f"{word[0]}{digit}{word[-1]}".encode())
+    for word, digit in CARDINAL_DIGITS.items()
+]
+FIRST_DIGIT_PATTERN: re.Pattern = re.compile(rb"^\d", re.MULTILINE)
+LAST_DIGIT_PATTERN: re.Pattern = re.compile(rb"\d$", re.MULTILINE)
+
+# Size of the byte ranges handed to each worker, and the smallest file worth parallelizing
+CHUNK_SIZE: int = 1 << 24
+MIN_PARALLEL_SIZE: int = 1 << 24
 
 def get_first_matching_digit(
         string: str,
@@ -98,37 +121,350 @@ def get_first_matching_digit(
 
     return num
 
-def get_calibration_value(lines: [str], include_cardinal_digits = False):
+class DigitAutomaton:
+    """
+    A precompiled Aho-Corasick automaton that finds digits in a string.
+
+    The automaton is compiled into a deterministic transition table, so every
+    character of a line costs a single dictionary lookup regardless of how many
+    patterns are being searched for. A mirrored automaton built over the
+    reversed patterns allows scanning lines from right to left.
+    """
+
+    def __init__(self, patterns: dict[str, int]) -> None:
+        """
+        Compile the forward and reverse automata for the given patterns.
+
+        Args:
+            patterns (dict[str, int]): A mapping of each pattern to the digit it represents.
+        """
+        self.transitions, self.outputs = DigitAutomaton.__compile(patterns)
+        self.reverse_transitions, self.reverse_outputs = DigitAutomaton.__compile(
+            {pattern[::-1]: digit for pattern, digit in patterns.items()}
+        )
+
+    @staticmethod
+    def __compile(patterns: dict[str, int]) -> [list[dict[str, int]], list[int]]:
+        """
+        Build the goto/failure trie for the patterns and flatten it into a DFA.
+
+        Args:
+            patterns (dict[str, int]): A mapping of each pattern to the digit it represents.
+
+        Returns:
+            [list[dict[str, int]], list[int]]: The transition table and the digit emitted by each state (0 for none).
+        """
+        transitions: list[dict[str, int]] = [{}]
+        outputs: list[int] = [0]
+
+        for pattern, digit in patterns.items():
+            state: int = 0
+            for char in pattern:
+                if char not in transitions[state]:
+                    transitions.append({})
+                    outputs.append(0)
+                    transitions[state][char] = len(transitions) - 1
+                state = transitions[state][char]
+            outputs[state] = digit
+
+        # Breadth-first walk that resolves failure links into direct transitions
+        failures: list[int] = [0] * len(transitions)
+        queue: deque[int] = deque(transitions[0].values())
+        while queue:
+            state: int = queue.popleft()
+            if not outputs[state]:
+                outputs[state] = outputs[failures[state]]
+
+            for char, next_state in list(transitions[state].items()):
+                failures[next_state] = transitions[failures[state]].get(char, 0) if state else 0
+                queue.append(next_state)
+
+            # Inherit the failure state's moves so the scan never backtracks
+            if state:
+                for char, next_state in transitions[failures[state]].items():
+                    transitions[state].setdefault(char, next_state)
+
+        return transitions, outputs
+
+    def first(self, string: str) -> int:
+        """
+        Returns the first digit in the string, scanning left to right.
+
+        Args:
+            string (str): The input string.
+
+        Returns:
+            int: The first digit found. Returns 0 if no digit is found.
+        """
+        transitions: list[dict[str, int]] = self.transitions
+        outputs: list[int] = self.outputs
+        state: int = 0
+        for char in string:
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                return outputs[state]
+
+        return 0
+
+    def last(self, string: str) -> int:
+        """
+        Returns the last digit in the string, scanning right to left.
+
+        Args:
+            string (str): The input string.
+
+        Returns:
+            int: The last digit found. Returns 0 if no digit is found.
+        """
+        transitions: list[dict[str, int]] = self.reverse_transitions
+        outputs: list[int] = self.reverse_outputs
+        state: int = 0
+        for char in reversed(string):
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                return outputs[state]
+
+        return 0
+
+    def first_and_last(self, string: str) -> [int, int]:
+        """
+        Returns the first and last digits in the string in a single left to right pass.
+
+        Overlapping matches such as "oneight" are all reported, so the last match
+        seen is the last digit of the string.
+
+        Args:
+            string (str): The input string.
+
+        Returns:
+            [int, int]: The first and last digits found. Both are 0 if no digit is found.
+        """
+        transitions: list[dict[str, int]] = self.transitions
+        outputs: list[int] = self.outputs
+        state: int = 0
+        first: int = 0
+        last: int = 0
+        for char in string:
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                last = outputs[state]
+                if not first:
+                    first = last
+
+        return first, last
+
+
+DIGIT_AUTOMATON: DigitAutomaton = DigitAutomaton(DIGITS)
+CARDINAL_DIGIT_AUTOMATON: DigitAutomaton = DigitAutomaton(DIGITS | CARDINAL_DIGITS)
+
+
+def get_digit_automaton(include_cardinal_digits: bool = False) -> DigitAutomaton:
+    """
+    Returns the precompiled automaton for the requested kind of digits.
+
+    Args:
+        include_cardinal_digits (bool, optional): Whether cardinal digits (one, two, three, etc.) are matched. Defaults to False.
+
+    Returns:
+        DigitAutomaton: The shared automaton.
+    """
+    if include_cardinal_digits:
+        return CARDINAL_DIGIT_AUTOMATON
+
+    return DIGIT_AUTOMATON
+
+def print_calibration_value(sum_: int, include_cardinal_digits: bool = False) -> None:
+    """
+    Print a calibration value.
+
+    Args:
+        sum_ (int): The calibration value.
+        include_cardinal_digits (bool, optional): Whether cardinal digits were included in the calculation. Defaults to False.
+    """
+    print("The Calibration value " + 
+          f"with{'' if include_cardinal_digits else 'out'} cardinal digits is: {sum_}")
+
+def get_calibration_value(lines: [str], include_cardinal_digits = False, verbose = False):
     """
     Calculate the calibration value based on the given lines of digits.
 
+    The first and last digit of each line are found in a single pass of the digit automaton.
+
     Args:
-        lines (list[str]): A list of strings representing the lines of digits.
+        lines (Iterable[str]): The lines of digits. Any iterable works, so lines can be streamed with utils.iter_lines.
         include_cardinal_digits (bool, optional): Whether to include cardinal digits in the calculation. Defaults to False.
+        verbose (bool, optional): Whether to print the calibration value. Defaults to False.
 
     Returns:
         int: The calibration value.
     """
     sum_: int = 0
+    automaton: DigitAutomaton = get_digit_automaton(include_cardinal_digits)
 
     for line in lines:
         num_1: int = 0
         num_2: int = 0
 
-        num_1 = get_first_matching_digit(line, False, include_cardinal_digits)
-        num_2 = get_first_matching_digit(line, True, include_cardinal_digits)
+        num_1, num_2 = automaton.first_and_last(line)
 
         sum_ += num_1 * 10 + num_2
 
 
-    print("The Calibration value " + 
-          f"with{'' if include_cardinal_digits else 'out'} cardinal digits is: {sum_}")
+    if verbose:
+        print_calibration_value(sum_, include_cardinal_digits)
     return sum_
 
-if __name__ == "__main__":
-    lines: [str] = utils.read_lines()
+def get_bulk_calibration_value(
+        buffer: bytes,
+        include_cardinal_digits: bool = False,
+        verbose: bool = False
+    ) -> int:
+    """
+    Calculate the calibration value of a whole document held in a single buffer.
+
+    Instead of visiting each line in Python, the buffer is reduced with bytes
+    operations that run in C: every byte other than 1-9 and newlines is deleted,
+    after which the first and last digit of every line sit right after and right
+    before a newline. Spelled-out digits are first rewritten in place, which costs
+    one extra pass over the buffer per cardinal digit.
+
+    Args:
+        buffer (bytes): The document, e.g. the contents of a file or an mmap. Any bytes-like object works.
+        include_cardinal_digits (bool, optional): Whether to include cardinal digits in the calculation. Defaults to False.
+        verbose (bool, optional): Whether to print the calibration value. Defaults to False.
+
+    Returns:
+        int: The calibration value, identical to get_calibration_value on the same lines.
+    """
+    data: bytes = buffer if isinstance(buffer, (bytes, bytearray)) else bytes(buffer)
+
+    if include_cardinal_digits:
+        for word, substitution in CARDINAL_DIGIT_SUBSTITUTIONS:
+            data = data.replace(word, substitution)
+
+    digits: bytes = data.translate(None, NON_DIGIT_BYTES)
+
+    first_digits: bytes = b"".join(FIRST_DIGIT_PATTERN.findall(digits))
+    last_digits: bytes = b"".join(LAST_DIGIT_PATTERN.findall(digits))
+
+    sum_: int = (
+        (sum(first_digits) - ord("0") * len(first_digits)) * 10
+        + sum(last_digits) - ord("0") * len(last_digits)
+    )
+
+    if verbose:
+        print_calibration_value(sum_, include_cardinal_digits)
+    return sum_
+
+def get_chunk_boundaries(file_path: str, chunk_size: int = CHUNK_SIZE) -> [tuple[int, int]]:
+    """
+    Split a file into byte ranges of roughly chunk_size bytes that start and end on line boundaries.
+
+    Args:
+        file_path (str): The path of the file.
+        chunk_size (int, optional): The target size of each range in bytes. Defaults to CHUNK_SIZE.
+
+    Returns:
+        list[tuple[int, int]]: The (start, end) offsets of each range, covering the whole file.
+    """
+    file_size: int = os.path.getsize(file_path)
+    boundaries: [tuple[int, int]] = []
+
+    with open(file_path, 'rb') as f:
+        start: int = 0
+        while start < file_size:
+            end: int = start + chunk_size
+            if end < file_size:
+                # Extend the range up to and including the next newline
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            end = min(end, file_size)
+
+            boundaries.append((start, end))
+            start = end
+
+    return boundaries
+
+def get_chunk_calibration_value(
+        file_path: str,
+        start: int,
+        end: int,
+        include_cardinal_digits: bool = False
+    ) -> int:
+    """
+    Calculate the calibration value of the lines within a byte range of a file.
+
+    The worker running this function opens the file itself, so only the path
+    and offsets are pickled and sent to it.
+
+    Args:
+        file_path (str): The path of the file.
+        start (int): The offset of the first byte of the range.
+        end (int): The offset one past the last byte of the range.
+        include_cardinal_digits (bool, optional): Whether to include cardinal digits in the calculation. Defaults to False.
+
+    Returns:
+        int: The calibration value of the range.
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        buffer: bytes = f.read(end - start)
+
+    return get_bulk_calibration_value(buffer, include_cardinal_digits)
+
+def get_parallel_calibration_value(
+        file_name: str,
+        include_cardinal_digits: bool = False,
+        num_workers: int = None,
+        chunk_size: int = CHUNK_SIZE,
+        data_dir_path: str = "./data",
+        test: bool = False,
+        verbose: bool = False
+    ) -> int:
+    """
+    Calculate the calibration value of a file by summing newline-aligned chunks across a process pool.
 
+    Files smaller than MIN_PARALLEL_SIZE, or runs with a single worker, are
+    processed serially chunk by chunk, so memory stays bounded by chunk_size.
+
+    Args:
+        file_name (str): The name of the input file.
+        include_cardinal_digits (bool, optional): Whether to include cardinal digits in the calculation. Defaults to False.
+        num_workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+        chunk_size (int, optional): The target size of each chunk in bytes. Defaults to CHUNK_SIZE.
+        data_dir_path (str, optional): The data directory. Defaults to "./data".
+        test (bool, optional): Whether to read from the test data directory. Defaults to False.
+        verbose (bool, optional): Whether to print the calibration value. Defaults to False.
+
+    Returns:
+        int: The calibration value, identical to the serial calculation.
+    """
+    file_path: str = utils.get_file_path(file_name, data_dir_path, test)
+    boundaries: [tuple[int, int]] = get_chunk_boundaries(file_path, chunk_size)
+    num_workers = num_workers or os.cpu_count() or 1
+
+    sum_: int = 0
+    if num_workers == 1 or len(boundaries) == 1 or os.path.getsize(file_path) < MIN_PARALLEL_SIZE:
+        for start, end in boundaries:
+            sum_ += get_chunk_calibration_value(file_path, start, end, include_cardinal_digits)
+    else:
+        with ProcessPoolExecutor(max_workers=min(num_workers, len(boundaries))) as executor:
+            partial_sums = executor.map(
+                get_chunk_calibration_value,
+                [file_path] * len(boundaries),
+                [start for start, _ in boundaries],
+                [end for _, end in boundaries],
+                [include_cardinal_digits] * len(boundaries),
+            )
+            sum_ = sum(partial_sums)
+
+    if verbose:
+        print_calibration_value(sum_, include_cardinal_digits)
+    return sum_
+
+if __name__ == "__main__":
     # Part 1
-    assert get_calibration_value(lines) == 54304
+    assert get_calibration_value(utils.iter_lines("day_1-data.txt"), verbose=True) == 54304
     # Part 2
-    assert get_calibration_value(lines, include_cardinal_digits=True) == 54418
\ No newline at end of file
+    assert get_calibration_value(utils.iter_lines("day_1-data.txt"), include_cardinal_digits=True, verbose=True) == 54418
\ No newline at end of file
@@ -1,7 +1,17 @@
+from array import array
+from bisect import bisect_right
 from dataclasses import dataclass
+from itertools import accumulate
 from math import prod
+from operator import add, mul
+from typing import Iterable, Iterator
 from utils import utils
 
+COLOR_INDEX: dict[str, int] = dict(red=0, green=1, blue=2)
+NUM_COLORS: int = len(COLOR_INDEX)
+# Largest dense prefix-sum table ThresholdIndex builds before falling back to a sorted layout
+MAX_TABLE_SIZE: int = 1 << 22
+
 @dataclass
 class BallDraw:
     """
@@ -69,6 +79,120 @@ def parse_line(string: str) -> dict:
     return dict(game_id=game_id, games=games)
 
 
+class GameStore:
+    """
+    A columnar store of games that avoids allocating an object per draw.
+
+    The store keeps three flat arrays:
+    - game_ids: The ID of each game.
+    - draw_offsets: The index of the first draw of each game, plus a final end offset,
+      so the draws of game i are draws draw_offsets[i] to draw_offsets[i + 1].
+    - counts: The red, green and blue counts of every draw, interleaved.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty GameStore.
+        """
+        self.game_ids: array = array("q")
+        self.draw_offsets: array = array("q", [0])
+        self.counts: array = array("q")
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "GameStore":
+        """
+        Build a GameStore from game lines.
+
+        Args:
+            lines (Iterable[str]): The game lines, e.g. from utils.iter_lines.
+
+        Returns:
+            GameStore: The store holding every game.
+        """
+        store: GameStore = cls()
+        for line in lines:
+            if line:
+                store.add_line(line)
+
+        return store
+
+    def add_line(self, string: str) -> None:
+        """
+        Parse a game line and append it to the store.
+
+        Args:
+            string (str): The game line, e.g. "Game 1: 3 blue, 4 red; 1 red, 2 green".
+        """
+        raw_game_id, raw_games = string.split(":")
+        self.game_ids.append(int(raw_game_id.split(" ")[1]))
+
+        counts: array = self.counts
+        for draw in raw_games.split(";"):
+            draw_counts: [int] = [0] * NUM_COLORS
+            for ball in draw.split(","):
+                raw_num, color = ball.strip().split(" ")
+                draw_counts[COLOR_INDEX[color]] += int(raw_num)
+            counts.extend(draw_counts)
+
+        self.draw_offsets.append(len(counts) // NUM_COLORS)
+
+    def __len__(self) -> int:
+        """
+        Get the number of games in the store.
+
+        Returns:
+            int: The number of games.
+        """
+        return len(self.game_ids)
+
+    def get_draws(self, index: int) -> [BallDraw]:
+        """
+        Get the draws of a game as BallDraw objects.
+
+        Args:
+            index (int): The position of the game in the store.
+
+        Returns:
+            list[BallDraw]: The draws of the game.
+        """
+        start: int = self.draw_offsets[index] * NUM_COLORS
+        end: int = self.draw_offsets[index + 1] * NUM_COLORS
+        counts: array = self.counts
+
+        return [BallDraw(*counts[i : i + NUM_COLORS]) for i in range(start, end, NUM_COLORS)]
+
+    def __getitem__(self, index: int) -> dict:
+        """
+        Get a game in the same form as parse_line.
+
+        Args:
+            index (int): The position of the game in the store.
+
+        Returns:
+            dict: A dictionary with the game_id and the list of BallDraw objects of the game.
+        """
+        return dict(game_id=self.game_ids[index], games=self.get_draws(index))
+
+    def get_minimum_required_balls(self) -> [array, array, array]:
+        """
+        Get the per-game maximum of each color, i.e. the fewest balls of each color the game needs.
+
+        Returns:
+            [array, array, array]: The red, green and blue requirements of each game.
+        """
+        offsets: array = self.draw_offsets
+        minimum_required_balls: [array] = []
+
+        for color in range(NUM_COLORS):
+            color_counts: array = self.counts[color::NUM_COLORS]
+            minimum_required_balls.append(array("q", [
+                max(color_counts[start:end], default=0)
+                for start, end in zip(offsets, offsets[1:])
+            ]))
+
+        return minimum_required_balls
+
+
 def get_games_checksum_and_power(
     games: [dict], max_red: int, max_green: int, max_blue: int
 ) -> [int, int]:
@@ -77,7 +201,8 @@ def get_games_checksum_and_power(
     number of red, green, and blue balls allowed.
 
     Args:
-        games (list[dict]): A list of games, where each game is represented as a dictionary.
+        games (list[dict] | GameStore): A list of games, where each game is represented as a dictionary,
+            or a GameStore, which is reduced column by column.
         max_red (int): The maximum number of red balls allowed.
         max_green (int): The maximum number of green balls allowed.
         max_blue (int): The maximum number of blue balls allowed.
@@ -86,6 +211,17 @@ def get_games_checksum_and_power(
         list[int, int]: A list containing the checksum and power of compatible games.
     """
     
+    if isinstance(games, GameStore):
+        reds, greens, blues = games.get_minimum_required_balls()
+        checksum: int = sum(
+            game_id
+            for game_id, red, green, blue in zip(games.game_ids, reds, greens, blues)
+            if red <= max_red and green <= max_green and blue <= max_blue
+        )
+        power: int = sum(map(mul, map(mul, reds, greens), blues))
+
+        return checksum, power
+
     compatible_games: [int] = []
     minimum_required_balls: [[int]] = []
     for game in games:
@@ -115,7 +251,241 @@ def get_games_checksum_and_power(
     return checksum, power
 
 
+def iter_minimum_required_balls(lines: Iterable[str]) -> Iterator[tuple[int, int, int, int]]:
+    """
+    Stream game lines and yield each game's ID and per-color maximum.
+
+    Each line is read once and reduced straight into running maxima, so no
+    BallDraw or per-game dictionary is created and the lines can come from a
+    file of any size.
+
+    Args:
+        lines (Iterable[str]): The game lines, e.g. from utils.iter_lines.
+
+    Yields:
+        tuple[int, int, int, int]: The game ID and the fewest red, green and blue balls the game needs.
+    """
+    for line in lines:
+        if not line:
+            continue
+
+        raw_game_id, raw_games = line.split(":")
+        max_counts: [int] = [0] * NUM_COLORS
+
+        for draw in raw_games.split(";"):
+            draw_counts: [int] = [0] * NUM_COLORS
+            for ball in draw.split(","):
+                raw_num, color = ball.split()
+                draw_counts[COLOR_INDEX[color]] += int(raw_num)
+
+            max_counts = list(map(max, max_counts, draw_counts))
+
+        yield int(raw_game_id.split(" ")[1]), *max_counts
+
+
+def iter_games_checksums_and_power(
+    lines: Iterable[str], thresholds: [tuple[int, int, int]]
+) -> Iterator[tuple[int, tuple[int], int]]:
+    """
+    Stream game lines and yield the running checksums and power after each game.
+
+    Args:
+        lines (Iterable[str]): The game lines, e.g. from utils.iter_lines.
+        thresholds (list[tuple[int, int, int]]): The (max_red, max_green, max_blue) bag configurations to check in the same pass.
+
+    Yields:
+        tuple[int, tuple[int], int]: The ID of the game just read, the running checksum for each
+            threshold set, and the running power.
+    """
+    checksums: [int] = [0] * len(thresholds)
+    power: int = 0
+
+    for game_id, red, green, blue in iter_minimum_required_balls(lines):
+        power += red * green * blue
+        for i, (max_red, max_green, max_blue) in enumerate(thresholds):
+            if red <= max_red and green <= max_green and blue <= max_blue:
+                checksums[i] += game_id
+
+        yield game_id, tuple(checksums), power
+
+
+def get_streamed_checksums_and_power(
+    lines: Iterable[str], thresholds: [tuple[int, int, int]]
+) -> [[int], int]:
+    """
+    Calculates the checksums for several bag configurations and the power in a single pass over the lines.
+
+    Args:
+        lines (Iterable[str]): The game lines, e.g. from utils.iter_lines.
+        thresholds (list[tuple[int, int, int]]): The (max_red, max_green, max_blue) bag configurations.
+
+    Returns:
+        list[list[int], int]: The checksum for each threshold set and the power of all games.
+    """
+    checksums: tuple[int] = (0,) * len(thresholds)
+    power: int = 0
+
+    for _, checksums, power in iter_games_checksums_and_power(lines, thresholds):
+        pass
+
+    return list(checksums), power
+
+
+class ThresholdIndex:
+    """
+    An index over the per-game minimum required balls that answers bag configuration queries without rescanning the games.
+
+    Each game becomes a point (red, green, blue) weighted by its ID, and a query
+    (max_red, max_green, max_blue) is the sum of the weights dominated by it.
+    When the distinct counts of each color are few enough, the index stores a
+    dense 3D prefix-sum table over the compressed coordinates, so a query is three
+    binary searches and one lookup. Otherwise the games are kept sorted by red,
+    and a query only scans the games whose red count fits the bag.
+    """
+
+    def __init__(self, minimum_required_balls: Iterable[tuple[int, int, int, int]]) -> None:
+        """
+        Build the index.
+
+        Args:
+            minimum_required_balls (Iterable[tuple[int, int, int, int]]): The game ID and the fewest red, green
+                and blue balls of each game, as yielded by iter_minimum_required_balls.
+        """
+        games: [tuple[int, int, int, int]] = sorted(
+            minimum_required_balls, key=lambda game: game[1]
+        )
+
+        self.power: int = sum(red * green * blue for _, red, green, blue in games)
+
+        self.reds: [int] = sorted({red for _, red, _, _ in games})
+        self.greens: [int] = sorted({green for _, _, green, _ in games})
+        self.blues: [int] = sorted({blue for _, _, _, blue in games})
+
+        self.table: array = None
+        self.game_ids: array = array("q", [game[0] for game in games])
+        self.sorted_reds: array = array("q", [game[1] for game in games])
+        self.sorted_greens: array = array("q", [game[2] for game in games])
+        self.sorted_blues: array = array("q", [game[3] for game in games])
+
+        if games and len(self.reds) * len(self.greens) * len(self.blues) <= MAX_TABLE_SIZE:
+            self.table = self.__build_table(games)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "ThresholdIndex":
+        """
+        Build the index from game lines in a single streaming pass.
+
+        Args:
+            lines (Iterable[str]): The game lines, e.g. from utils.iter_lines.
+
+        Returns:
+            ThresholdIndex: The index over the games.
+        """
+        return cls(iter_minimum_required_balls(lines))
+
+    @classmethod
+    def from_store(cls, store: GameStore) -> "ThresholdIndex":
+        """
+        Build the index from a GameStore.
+
+        Args:
+            store (GameStore): The parsed games.
+
+        Returns:
+            ThresholdIndex: The index over the games.
+        """
+        return cls(zip(store.game_ids, *store.get_minimum_required_balls()))
+
+    def __build_table(self, games: [tuple[int, int, int, int]]) -> array:
+        """
+        Build the dense 3D prefix-sum table of game IDs over the compressed color coordinates.
+
+        Args:
+            games (list[tuple[int, int, int, int]]): The game ID and minimum required balls of each game.
+
+        Returns:
+            array: The flattened table, indexed by (red_index * num_greens + green_index) * num_blues + blue_index.
+        """
+        num_greens: int = len(self.greens)
+        num_blues: int = len(self.blues)
+        plane_size: int = num_greens * num_blues
+
+        red_index: dict[int, int] = {red: i for i, red in enumerate(self.reds)}
+        green_index: dict[int, int] = {green: i for i, green in enumerate(self.greens)}
+        blue_index: dict[int, int] = {blue: i for i, blue in enumerate(self.blues)}
+
+        table: array = array("q", bytes(8 * len(self.reds) * plane_size))
+        for game_id, red, green, blue in games:
+            table[(red_index[red] * num_greens + green_index[green]) * num_blues + blue_index[blue]] += game_id
+
+        # Accumulate along blue, then green, then red
+        for start in range(0, len(table), num_blues):
+            table[start : start + num_blues] = array("q", accumulate(table[start : start + num_blues]))
+
+        for plane in range(0, len(table), plane_size):
+            for start in range(plane + num_blues, plane + plane_size, num_blues):
+                table[start : start + num_blues] = array("q", map(
+                    add, table[start : start + num_blues], table[start - num_blues : start]
+                ))
+
+        for start in range(plane_size, len(table), plane_size):
+            table[start : start + plane_size] = array("q", map(
+                add, table[start : start + plane_size], table[start - plane_size : start]
+            ))
+
+        return table
+
+    def get_checksum(self, max_red: int, max_green: int, max_blue: int) -> int:
+        """
+        Calculates the sum of the IDs of the games compatible with a bag configuration.
+
+        Args:
+            max_red (int): The maximum number of red balls allowed.
+            max_green (int): The maximum number of green balls allowed.
+            max_blue (int): The maximum number of blue balls allowed.
+
+        Returns:
+            int: The checksum of the compatible games.
+        """
+        if self.table is not None:
+            red_index: int = bisect_right(self.reds, max_red) - 1
+            green_index: int = bisect_right(self.greens, max_green) - 1
+            blue_index: int = bisect_right(self.blues, max_blue) - 1
+            if red_index < 0 or green_index < 0 or blue_index < 0:
+                return 0
+
+            return self.table[
+                (red_index * len(self.greens) + green_index) * len(self.blues) + blue_index
+            ]
+
+        end: int = bisect_right(self.sorted_reds, max_red)
+        return sum(
+            game_id
+            for game_id, green, blue in zip(
+                self.game_ids[:end], self.sorted_greens[:end], self.sorted_blues[:end]
+            )
+            if green <= max_green and blue <= max_blue
+        )
+
+    def get_checksums(self, thresholds: Iterable[tuple[int, int, int]]) -> [int]:
+        """
+        Calculates the checksum of a batch of bag configurations.
+
+        Args:
+            thresholds (Iterable[tuple[int, int, int]]): The (max_red, max_green, max_blue) bag configurations.
+
+        Returns:
+            list[int]: The checksum of each bag configuration.
+        """
+        return [self.get_checksum(*threshold) for threshold in thresholds]
+
+
 if __name__ == "__main__":
-    games: [dict] = utils.read_lines()
+    test: bool = False
+    file_name: str = "day_2-data-test.txt" if test else "day_2-data.txt"
+    lines: Iterable[str] = utils.iter_lines(file_name, test=test)
 
-    get_games_checksum_and_power(games, 12, 13, 14)
+    checksums, power = get_streamed_checksums_and_power(lines, [(12, 13, 14)])
+    checksum: int = checksums[0]
+    print(f"{checksum=}")
+    print(f"{power=}")
@@ -1,4 +1,16 @@
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import combinations, repeat
+from typing import Iterable
 from utils import utils
+import re
+
+BACKENDS: tuple[str] = ("grid", "bitset")
+NUMBER_PATTERN: re.Pattern = re.compile(rb"\d+")
+# Translation tables turning a row into a string of "0"/"1" symbol flags
+ALL_SYMBOLS_TABLE: bytes = bytes(
+    ord("0") if byte in b"0123456789." else ord("1") for byte in range(256)
+)
 
 
 def get_symbol_and_number_positions(
@@ -13,7 +25,8 @@ def get_symbol_and_number_positions(
         token (str, optional): The symbol token to include. Defaults to "*".
 
     Returns:
-        dict: A dictionary containing the positions of numbers and symbols.
+        dict: A dictionary containing the positions of numbers and symbols, the value of each number,
+            and a number_grid mapping every cell to the index of the number covering it (-1 if none).
 
     Example:
         lines = [
@@ -29,10 +42,23 @@ def get_symbol_and_number_positions(
     num_lines: int = len(lines)
     num_chars: int = len(lines[0])
 
+    def add_number(num_row: int, num_col: int, num_len: int) -> None:
+        """
+        Record a number and mark the cells it covers in the number grid.
+        """
+        number_id: int = len(number_positions)
+        number_positions.append((num_row, num_col, num_len))
+        number_values.append(int(lines[num_row][num_col : num_col + num_len]))
+        number_grid[num_row][num_col : num_col + num_len] = [number_id] * num_len
+
     number_positions: [[int, int, int]] = []
+    number_values: [int] = []
+    number_grid: [[int]] = []
     symbol_positions: [[int, int]] = []
 
     for i in range(num_lines):
+        row: [int] = [-1] * num_chars
+        number_grid.append(row)
         num_length: int = 0
         for j in range(num_chars):
             char: str = lines[i][j]
@@ -41,11 +67,11 @@ def get_symbol_and_number_positions(
 
                 # Add number to list if end of line reached
                 if j + 1 == num_chars:
-                    number_positions.append((i, j - num_length + 1, num_length))
+                    add_number(i, j - num_length + 1, num_length)
                     num_length = 0
             else:
                 if num_length:
-                    number_positions.append((i, j - num_length, num_length))
+                    add_number(i, j - num_length, num_length)
                     num_length = 0
                 if include_all_symbols:
                     if char != ".":
@@ -54,16 +80,42 @@ def get_symbol_and_number_positions(
                     symbol_positions.append((i, j))
 
     positions: dict = dict(
-        number_positions=number_positions, symbol_positions=symbol_positions
+        number_positions=number_positions,
+        symbol_positions=symbol_positions,
+        number_values=number_values,
+        number_grid=number_grid,
     )
 
     return positions
 
 
+def get_adjacent_number_ids(number_grid: [[int]], sym_row: int, sym_col: int) -> [int]:
+    """
+    Get the numbers touching a cell, including diagonally, by reading its 3x3 neighbourhood in the number grid.
+
+    Args:
+        number_grid (list[list[int]]): The grid mapping every cell to the index of the number covering it (-1 if none).
+        sym_row (int): The row of the cell.
+        sym_col (int): The column of the cell.
+
+    Returns:
+        list[int]: The sorted indices of the adjacent numbers.
+    """
+    number_ids: set[int] = set()
+    for row in number_grid[max(sym_row - 1, 0) : sym_row + 2]:
+        number_ids.update(row[max(sym_col - 1, 0) : sym_col + 2])
+
+    number_ids.discard(-1)
+    return sorted(number_ids)
+
+
 def filter_number_with_adjacent_symbols(symbol_and_number_positions: dict):
     """
     Filter number positions that have adjacent symbols.
 
+    Only the neighbourhood of each symbol is visited, so the cost grows with the
+    number of symbols rather than with numbers times symbols.
+
     Args:
         symbol_and_number_positions (dict): A dictionary containing the positions of symbols and numbers.
 
@@ -74,19 +126,15 @@ def filter_number_with_adjacent_symbols(symbol_and_number_positions: dict):
         "number_positions"
     ]
     symbol_positions: [[int, int]] = symbol_and_number_positions["symbol_positions"]
+    number_grid: [[int]] = symbol_and_number_positions["number_grid"]
 
-    filtered_number_positions: [[int, int, int]] = []
-    for num in number_positions:
-        num_row, num_col, num_len = num
-        for sym in symbol_positions:
-            sym_row, sym_col = sym
+    adjacent_number_ids: set[int] = set()
+    for sym_row, sym_col in symbol_positions:
+        adjacent_number_ids.update(get_adjacent_number_ids(number_grid, sym_row, sym_col))
 
-            if (
-                num_row - 1 <= sym_row <= num_row + 1
-                and num_col - 1 <= sym_col <= num_col + num_len
-            ):
-                filtered_number_positions.append(num)
-                break
+    filtered_number_positions: [[int, int, int]] = [
+        number_positions[number_id] for number_id in sorted(adjacent_number_ids)
+    ]
 
     return filtered_number_positions
 
@@ -95,6 +143,9 @@ def get_number_powers(symbol_and_number_positions: dict):
     """
     Calculate the powers of adjacent numbers based on their positions.
 
+    Every pair of numbers adjacent to the same symbol contributes the product of
+    their values.
+
     Args:
         symbol_and_number_positions (dict): A dictionary containing the positions of symbols and numbers.
 
@@ -102,59 +153,26 @@ def get_number_powers(symbol_and_number_positions: dict):
         list: A list of powers calculated from adjacent numbers.
     """
 
-    number_positions: [[int, int, int]] = symbol_and_number_positions[
-        "number_positions"
-    ]
     symbol_positions: [[int, int]] = symbol_and_number_positions["symbol_positions"]
+    number_values: [int] = symbol_and_number_positions["number_values"]
+    number_grid: [[int]] = symbol_and_number_positions["number_grid"]
     powers: [int] = []
 
-    number_positions_length: int = len(number_positions)
-    for sym in symbol_positions:
-        sym_row, sym_col = sym
+    for sym_row, sym_col in symbol_positions:
+        number_ids: [int] = get_adjacent_number_ids(number_grid, sym_row, sym_col)
 
-        for i in range(number_positions_length):
-            num_prev: [int, int, int] = number_positions[i]
-            num_row_prev, num_col_prev, num_len_prev = num_prev
-            left_prev: int = num_col_prev
-            right_prev: int = num_col_prev + num_len_prev
-            num_prev_int: int = int(get_numbers_from_positions([num_prev])[0])
-
-            # Ignore numbers too far up
-            if (
-                (num_row_prev < sym_row and sym_row - num_row_prev > 1)
-                or (right_prev < sym_col and sym_col - right_prev >= 1)
-                or (sym_col < left_prev and left_prev - sym_col > 1)
-            ):
-                continue
-
-            for j in range(i + 1, number_positions_length):
-                num_curr: [int, int, int] = number_positions[j]
-                num_row_curr, num_col_curr, num_len_curr = num_curr
-                left_curr: int = num_col_curr
-                right_curr: int = num_col_curr + num_len_curr
-
-                # Ignore numbers too far up
-                if (
-                    (num_row_curr < sym_row and sym_row - num_row_curr > 1)
-                    or (right_curr < sym_col and sym_col - right_curr >= 1)
-                    or (sym_col < left_curr and left_curr - sym_col > 1)
-                ):
-                    continue
-                # Remaining numbers are outside the area of adjacent numbers
-                elif num_row_curr > sym_row and num_row_curr - sym_row > 1:
-                    break
-
-                num_curr_int: int = int(get_numbers_from_positions([num_curr])[0])
-                powers.append(num_prev_int * num_curr_int)
+        for id_prev, id_curr in combinations(number_ids, 2):
+            powers.append(number_values[id_prev] * number_values[id_curr])
 
     return powers
 
 
-def get_symbols_from_positions(symbol_positions: [[int, int, int]]) -> [int]:
+def get_symbols_from_positions(lines: [str], symbol_positions: [[int, int, int]]) -> [int]:
     """
     Get symbols from the given positions in a 2D list.
 
     Args:
+        lines: The lines of the schematic.
         symbol_positions: A list of symbol positions, where each position is represented as a tuple (row, column).
 
     Returns:
@@ -168,11 +186,12 @@ def get_symbols_from_positions(symbol_positions: [[int, int, int]]) -> [int]:
     return list(symbols)
 
 
-def get_numbers_from_positions(number_positions: [[int, int, int]]) -> [int]:
+def get_numbers_from_positions(lines: [str], number_positions: [[int, int, int]]) -> [int]:
     """
     Extracts numbers from specified positions in a 2D list of lines.
 
     Args:
+        lines: The lines of the schematic.
         number_positions: A list of number positions, where each position is represented as [row, column, length].
 
     Returns:
@@ -187,52 +206,320 @@ def get_numbers_from_positions(number_positions: [[int, int, int]]) -> [int]:
     return numbers
 
 
+def get_symbol_mask_table(include_all_symbols: bool = True, token: str = "*") -> bytes:
+    """
+    Get the translation table that flags symbol bytes with "1" and every other byte with "0".
+
+    Args:
+        include_all_symbols (bool, optional): Whether every non-digit, non-"." character is a symbol. Defaults to True.
+        token (str, optional): The only symbol when include_all_symbols is False. Defaults to "*".
+
+    Returns:
+        bytes: A table for bytes.translate.
+    """
+    if include_all_symbols:
+        return ALL_SYMBOLS_TABLE
+
+    token_byte: int = ord(token)
+    return bytes(ord("1") if byte == token_byte else ord("0") for byte in range(256))
+
+
+def get_dilated_symbol_masks(rows: [bytes], include_all_symbols: bool = True, token: str = "*") -> [int]:
+    """
+    Get a bitmask per row of the cells touching a symbol, including diagonally.
+
+    Each row's symbol flags become one integer, with bit j standing for column j,
+    and the 3x3 dilation is a handful of shifts and ORs over whole rows.
+
+    Args:
+        rows (list[bytes]): The rows of the schematic.
+        include_all_symbols (bool, optional): Whether every non-digit, non-"." character is a symbol. Defaults to True.
+        token (str, optional): The only symbol when include_all_symbols is False. Defaults to "*".
+
+    Returns:
+        list[int]: The dilated symbol mask of each row.
+    """
+    table: bytes = get_symbol_mask_table(include_all_symbols, token)
+
+    horizontal_masks: [int] = []
+    for row in rows:
+        full: int = (1 << len(row)) - 1
+        mask: int = int(row.translate(table)[::-1] or b"0", 2)
+        horizontal_masks.append((mask | (mask << 1) | (mask >> 1)) & full)
+
+    padded_masks: [int] = [0, *horizontal_masks, 0]
+    return [
+        padded_masks[i] | padded_masks[i + 1] | padded_masks[i + 2]
+        for i in range(len(rows))
+    ]
+
+
+def get_bitset_part_numbers_sum(rows: [bytes], include_all_symbols: bool = True, token: str = "*") -> int:
+    """
+    Sum the numbers touching a symbol using row bitmasks.
+
+    Args:
+        rows (list[bytes]): The rows of the schematic.
+        include_all_symbols (bool, optional): Whether every non-digit, non-"." character is a symbol. Defaults to True.
+        token (str, optional): The only symbol when include_all_symbols is False. Defaults to "*".
+
+    Returns:
+        int: The sum of the part numbers.
+    """
+    total: int = 0
+    for row, mask in zip(rows, get_dilated_symbol_masks(rows, include_all_symbols, token)):
+        if not mask:
+            continue
+
+        flags: str = format(mask, f"0{len(row)}b")[::-1]
+        for number in NUMBER_PATTERN.finditer(row):
+            if "1" in flags[number.start() : number.end()]:
+                total += int(number.group())
+
+    return total
+
+
+def get_bitset_gear_powers_sum(rows: [bytes], token: str = "*") -> int:
+    """
+    Sum the products of every pair of numbers touching the same token.
+
+    The digit runs of each row are labelled once, then every token looks up its
+    neighbours in the three surrounding rows with a binary search.
+
+    Args:
+        rows (list[bytes]): The rows of the schematic.
+        token (str, optional): The gear symbol. Defaults to "*".
+
+    Returns:
+        int: The sum of the gear powers.
+    """
+    starts: [[int]] = []
+    ends: [[int]] = []
+    values: [[int]] = []
+    for row in rows:
+        numbers: [re.Match] = list(NUMBER_PATTERN.finditer(row))
+        starts.append([number.start() for number in numbers])
+        ends.append([number.end() for number in numbers])
+        values.append([int(number.group()) for number in numbers])
+
+    token_pattern: re.Pattern = re.compile(re.escape(token.encode()))
+    total: int = 0
+    for sym_row, row in enumerate(rows):
+        for symbol in token_pattern.finditer(row):
+            sym_col: int = symbol.start()
+
+            adjacent_values: [int] = []
+            for num_row in range(max(sym_row - 1, 0), min(sym_row + 2, len(rows))):
+                i: int = bisect_right(starts[num_row], sym_col + 1) - 1
+                while i >= 0 and ends[num_row][i] >= sym_col:
+                    adjacent_values.append(values[num_row][i])
+                    i -= 1
+
+            total += sum(prev * curr for prev, curr in combinations(adjacent_values, 2))
+
+    return total
+
+
+def get_bitset_checksum(lines: [str], include_all_symbols: bool = True, token: str = "*") -> int:
+    """
+    Calculate the checksum of a schematic with whole-row bitmask operations.
+
+    Args:
+        lines: A list of strings representing the lines.
+        include_all_symbols: A boolean indicating whether to include all symbols in the calculation.
+        token: A string representing the token to be used as a symbol.
+
+    Returns:
+        The checksum as an integer, identical to the grid backend.
+    """
+    rows: [bytes] = [line.encode() for line in lines]
+
+    if include_all_symbols:
+        return get_bitset_part_numbers_sum(rows, include_all_symbols, token)
+
+    return get_bitset_gear_powers_sum(rows, token)
+
+
+class Schematic:
+    """
+    An engine schematic that owns its grid and caches everything parsed from it.
+
+    The grid is stored as an immutable tuple and the caches are only ever
+    filled with values derived from it, so a Schematic can be shared between
+    threads (at worst two threads parse the same positions once each) and
+    pickled to worker processes.
+    """
+
+    def __init__(self, lines: Iterable[str]) -> None:
+        """
+        Initialize a Schematic object.
+
+        Args:
+            lines (Iterable[str]): The lines of the schematic.
+        """
+        self.lines: tuple[str] = tuple(lines)
+        self.number_values: dict[tuple[int, int, int], int] = {}
+        self.__positions: dict[tuple[bool, str], dict] = {}
+
+    def get_positions(self, include_all_symbols: bool = True, token: str = "*") -> dict:
+        """
+        Get the positions of symbols and numbers, parsing the grid only once per kind of symbol.
+
+        Args:
+            include_all_symbols (bool, optional): Whether to include all symbols or only the specified token. Defaults to True.
+            token (str, optional): The symbol token to include. Defaults to "*".
+
+        Returns:
+            dict: The dictionary returned by get_symbol_and_number_positions.
+        """
+        key: tuple[bool, str] = (include_all_symbols, token)
+        positions: dict = self.__positions.get(key)
+
+        if positions is None:
+            positions = get_symbol_and_number_positions(self.lines, include_all_symbols, token)
+            self.number_values.update(
+                zip(positions["number_positions"], positions["number_values"])
+            )
+            self.__positions[key] = positions
+
+        return positions
+
+    def get_numbers_from_positions(self, number_positions: [[int, int, int]]) -> [int]:
+        """
+        Get the values of the numbers at the given positions, parsing each position at most once.
+
+        Args:
+            number_positions (list[list[int, int, int]]): The positions, each represented as [row, column, length].
+
+        Returns:
+            list[int]: The values of the numbers.
+        """
+        numbers: [int] = []
+        for num in number_positions:
+            value: int = self.number_values.get(num)
+            if value is None:
+                value = self.number_values[num] = get_numbers_from_positions(self.lines, [num])[0]
+            numbers.append(value)
+
+        return numbers
+
+    def get_symbols(self, include_all_symbols: bool = True, token: str = "*") -> [str]:
+        """
+        Get the distinct symbols of the schematic.
+
+        Args:
+            include_all_symbols (bool, optional): Whether to include all symbols or only the specified token. Defaults to True.
+            token (str, optional): The symbol token to include. Defaults to "*".
+
+        Returns:
+            list[str]: The distinct symbols.
+        """
+        positions: dict = self.get_positions(include_all_symbols, token)
+        return get_symbols_from_positions(self.lines, positions["symbol_positions"])
+
+    def get_checksum(
+        self, include_all_symbols: bool = True, token: str = "*", backend: str = "grid"
+    ) -> int:
+        """
+        Calculate the checksum of the schematic.
+
+        Args:
+            include_all_symbols: A boolean indicating whether to include all symbols in the calculation.
+            token: A string representing the token to be used as a symbol.
+            backend: Either "grid", which indexes numbers in an occupancy grid, or "bitset",
+                which works on whole-row bitmasks and suits very large schematics.
+
+        Returns:
+            The checksum as an integer.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+
+        if backend == "bitset":
+            return get_bitset_checksum(self.lines, include_all_symbols, token)
+
+        symbol_and_number_positions = self.get_positions(include_all_symbols, token)
+
+        valid_part_numbers: [int] = []
+        if include_all_symbols:
+            filtered_number_positions = filter_number_with_adjacent_symbols(
+                symbol_and_number_positions
+            )
+            valid_part_numbers = self.get_numbers_from_positions(filtered_number_positions)
+        else:
+            valid_part_numbers = get_number_powers(symbol_and_number_positions)
+
+        checksum: int = sum(valid_part_numbers)
+
+        return checksum
+
+
 def get_checksum(
-    lines: [str], include_all_symbols: bool = True, token: str = "*"
+    lines: [str], include_all_symbols: bool = True, token: str = "*", backend: str = "grid"
 ) -> int:
     """
     Calculate the checksum of a list of lines.
 
     Args:
-        lines: A list of strings representing the lines.
+        lines: A list of strings representing the lines, or a Schematic.
         include_all_symbols: A boolean indicating whether to include all symbols in the calculation.
         token: A string representing the token to be used as a symbol.
+        backend: Either "grid", which indexes numbers in an occupancy grid, or "bitset",
+            which works on whole-row bitmasks and suits very large schematics.
 
     Returns:
         The checksum as an integer.
     """
+    schematic: Schematic = lines if isinstance(lines, Schematic) else Schematic(lines)
+    return schematic.get_checksum(include_all_symbols, token, backend)
+
+
+def get_checksums(
+    schematics: Iterable[[str]],
+    include_all_symbols: bool = True,
+    token: str = "*",
+    backend: str = "grid",
+    num_workers: int = None,
+    use_processes: bool = False,
+) -> [int]:
+    """
+    Calculate the checksums of many schematics concurrently.
 
-    symbol_and_number_positions = get_symbol_and_number_positions(
-        lines, include_all_symbols, token
-    )
-    filtered_number_positions = filter_number_with_adjacent_symbols(
-        symbol_and_number_positions
-    )
-
-    valid_part_numbers: [int] = []
-    if include_all_symbols:
-        valid_part_numbers = get_numbers_from_positions(filtered_number_positions)
-    else:
-        valid_part_numbers = get_number_powers(symbol_and_number_positions)
-
-    symbols: [int] = get_symbols_from_positions(
-        symbol_and_number_positions["symbol_positions"]
-    )
-    print(f"{symbols=}")
+    Args:
+        schematics: The schematics, each given as a list of lines or a Schematic.
+        include_all_symbols: A boolean indicating whether to include all symbols in the calculation.
+        token: A string representing the token to be used as a symbol.
+        backend: The backend passed on to get_checksum.
+        num_workers: The number of worker threads or processes. Defaults to the executor's default.
+        use_processes: Whether to score the schematics in a process pool instead of a thread pool.
 
-    checksum: int = sum(valid_part_numbers)
+    Returns:
+        The checksum of each schematic, in order.
+    """
+    schematics = list(schematics)
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
 
-    return checksum
+    with executor_class(max_workers=num_workers) as executor:
+        checksums = executor.map(
+            get_checksum,
+            schematics,
+            repeat(include_all_symbols, len(schematics)),
+            repeat(token, len(schematics)),
+            repeat(backend, len(schematics)),
+        )
+        return list(checksums)
 
 
 if __name__ == "__main__":
     test: bool = False
-    lines: [str] = utils.read_lines("day_3-data.txt", test=test)
+    schematic: Schematic = Schematic(utils.iter_lines("day_3-data.txt", test=test))
 
-    checksum_part_1: int = get_checksum(lines)
+    checksum_part_1: int = schematic.get_checksum()
+    print(f"symbols={schematic.get_symbols()}")
     print(f"{checksum_part_1=}")
 
-    checksum_part_2: int = get_checksum(lines, include_all_symbols=False, token="*")
+    checksum_part_2: int = schematic.get_checksum(include_all_symbols=False, token="*")
+    print(f"symbols={schematic.get_symbols(include_all_symbols=False, token='*')}")
     print(f"{checksum_part_2=}")
 
     if test:
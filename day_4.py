@@ -1,9 +1,19 @@
+from array import array
+from collections import deque
+from copy import copy
 from dataclasses import dataclass
+from functools import reduce
+from operator import or_
+from typing import Iterable
 from utils import utils
+import json
+import os
 import re
 
 FILENAME: str = "day_4-data.txt"
 PATTERN: str = r"(\s{2,})"
+# Initial number of cards a CardTokenizer makes room for
+TOKENIZER_CAPACITY: int = 1 << 10
 
 
 @dataclass
@@ -73,6 +83,68 @@ class Game:
         self.copies += n
 
 
+def get_number_mask(numbers: [int]) -> int:
+    """
+    Packs a collection of small non-negative numbers into an integer bitmask.
+
+    Args:
+        numbers (list[int]): The numbers to pack.
+
+    Returns:
+        int: A bitmask with bit n set for every number n.
+    """
+    return reduce(or_, (1 << num for num in numbers), 0)
+
+
+class Card:
+    """
+    A compact scratchcard that stores each side as an integer bitmask.
+
+    The number of matching numbers is computed once, with a popcount, when the
+    card is created.
+    """
+
+    __slots__ = ("card_id", "winning_mask", "played_mask", "matches")
+
+    def __init__(
+        self, card_id: int, winning_numbers: [int], played_numbers: [int]
+    ) -> None:
+        """
+        Initialize a Card object with the given card ID, winning numbers, and played numbers.
+
+        Parameters:
+        card_id (int): The ID of the card.
+        winning_numbers (list[int]): The list of winning numbers.
+        played_numbers (list[int]): The list of played numbers.
+        """
+        self.card_id: int = card_id
+        self.winning_mask: int = get_number_mask(winning_numbers)
+        self.played_mask: int = get_number_mask(played_numbers)
+        self.matches: int = (self.winning_mask & self.played_mask).bit_count()
+
+    @property
+    def points(self) -> int:
+        """
+        Calculates the points earned by the card.
+
+        Returns:
+            int: The points earned by the card.
+        """
+        if self.matches:
+            return 1 << (self.matches - 1)
+
+        return 0
+
+    def __repr__(self) -> str:
+        """
+        Get the string representation of the Card object.
+
+        Returns:
+            str: The string representation of the Card object.
+        """
+        return f"Card(card_id={self.card_id}, matches={self.matches})"
+
+
 def parse_input(lines: [str]) -> [str]:
     """
     Parses the input lines by removing a specific pattern from each line.
@@ -130,16 +202,364 @@ def extract_games(lines: [str]) -> [Game]:
     return games
 
 
-def get_copies(games: [Game]) -> [Game]:
+def extract_cards(lines: [str]) -> [Card]:
+    """
+    Extracts card information from a list of lines and returns a list of Card objects.
+
+    Runs of whitespace are handled directly, so the lines do not need to go
+    through parse_input first.
+
+    Parameters:
+    lines (Iterable[str]): The card lines.
+
+    Returns:
+    list[Card]: A list of Card objects.
+    """
+    cards: [Card] = []
+    for line in lines:
+        card, numbers_raw = line.split(":")
+        winning_numbers_raw, played_numbers_raw = numbers_raw.split("|")
+
+        cards.append(Card(
+            int(card.split()[1]),
+            map(int, winning_numbers_raw.split()),
+            map(int, played_numbers_raw.split()),
+        ))
+
+    return cards
+
+
+def get_match_counts(cards: [Card]) -> array:
+    """
+    Collects the number of matching numbers of each card.
+
+    Parameters:
+    cards (list[Card]): The cards, ordered by card ID.
+
+    Returns:
+    array: The match count of each card.
+    """
+    return array("l", [card.matches for card in cards])
+
+
+def tokenize_card(line: bytes) -> tuple[int, int]:
+    """
+    Reads the card ID and match count of a card line directly from its bytes.
+
+    Args:
+        line (bytes): The card line, e.g. b"Card 1: 41 48 | 83 86 48".
+
+    Returns:
+        tuple[int, int]: The card ID and the number of matching numbers, or None for a blank line.
+    """
+    colon: int = line.find(b":")
+    if colon == -1:
+        return None
+
+    bar: int = line.find(b"|", colon)
+    card_id: int = int(line[line.rfind(b" ", 0, colon) : colon])
+    matches: int = len(
+        set(map(int, line[colon + 1 : bar].split())).intersection(
+            map(int, line[bar + 1 :].split())
+        )
+    )
+
+    return card_id, matches
+
+
+class CardTokenizer:
+    """
+    A streaming tokenizer that reads card lines from raw bytes into preallocated arrays.
+
+    Chunks of any size can be fed in, e.g. straight from a file or an mmap; a
+    line split across chunks is carried over to the next one. Each line is cut
+    with bytes.find and bytes.split only, without regular expressions or
+    decoding to str, and its card ID and match count are written into arrays
+    that grow geometrically.
+    """
+
+    def __init__(self, capacity: int = TOKENIZER_CAPACITY) -> None:
+        """
+        Initialize a CardTokenizer object.
+
+        Args:
+            capacity (int): The number of cards to preallocate room for. Defaults to TOKENIZER_CAPACITY.
+        """
+        capacity = max(capacity, 1)
+        self.size: int = 0
+        self.__card_ids: array = array("l", bytes(array("l").itemsize * capacity))
+        self.__match_counts: array = array("l", bytes(array("l").itemsize * capacity))
+        self.__remainder: bytes = b""
+
+    @property
+    def card_ids(self) -> array:
+        """
+        Returns the IDs of the cards read so far.
+
+        Returns:
+            array: The card IDs.
+        """
+        return self.__card_ids[: self.size]
+
+    @property
+    def match_counts(self) -> array:
+        """
+        Returns the match counts of the cards read so far.
+
+        Returns:
+            array: The match count of each card.
+        """
+        return self.__match_counts[: self.size]
+
+    def __add_card(self, line: bytes) -> None:
+        """
+        Tokenize one card line and append its card ID and match count.
+
+        Args:
+            line (bytes): The card line, e.g. b"Card 1: 41 48 | 83 86 48".
+        """
+        card: tuple[int, int] = tokenize_card(line)
+        if card is None:
+            return
+
+        if self.size == len(self.__card_ids):
+            self.__card_ids.extend(self.__card_ids)
+            self.__match_counts.extend(self.__match_counts)
+
+        self.__card_ids[self.size], self.__match_counts[self.size] = card
+        self.size += 1
+
+    def feed(self, chunk: bytes) -> int:
+        """
+        Tokenize every complete line of a chunk.
+
+        Args:
+            chunk (bytes): The next bytes of the input.
+
+        Returns:
+            int: The number of cards read so far.
+        """
+        lines: [bytes] = (self.__remainder + chunk).split(b"\n")
+        self.__remainder = lines.pop()
+
+        for line in lines:
+            self.__add_card(line)
+
+        return self.size
+
+    def close(self) -> int:
+        """
+        Tokenize the final line if the input did not end with a newline.
+
+        Returns:
+            int: The number of cards read.
+        """
+        self.__add_card(self.__remainder)
+        self.__remainder = b""
+
+        return self.size
+
+    @classmethod
+    def from_file(cls, file_name: str, chunk_size: int = 1 << 20, test: bool = False) -> "CardTokenizer":
+        """
+        Tokenize a card file chunk by chunk.
+
+        Args:
+            file_name (str): The name of the input file.
+            chunk_size (int): The number of bytes read at a time. Defaults to 1 MiB.
+            test (bool): Whether to read from the test data directory. Defaults to False.
+
+        Returns:
+            CardTokenizer: The tokenizer holding every card of the file.
+        """
+        tokenizer: CardTokenizer = cls()
+        with open(utils.get_file_path(file_name, test=test), "rb") as f:
+            while chunk := f.read(chunk_size):
+                tokenizer.feed(chunk)
+
+        tokenizer.close()
+        return tokenizer
+
+
+class IncrementalScorer:
+    """
+    Scores cards as they are appended, without reprocessing earlier cards.
+
+    Part 1 points are a running sum. For part 2, the copies won by earlier
+    cards are kept as a window of pending difference updates over the cards
+    still to come, so each new card settles its copy count in O(1) per card
+    plus O(1) per card it wins. The whole state can be checkpointed to disk
+    and restored after a restart.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an IncrementalScorer with no cards.
+        """
+        self.num_cards: int = 0
+        self.points: int = 0
+        self.total_copies: int = 0
+        self.__running: int = 0
+        self.__pending: deque[int] = deque()
+
+    def add_card(self, matches: int) -> int:
+        """
+        Score the next card from its match count.
+
+        Args:
+            matches (int): The number of matching numbers of the card.
+
+        Returns:
+            int: The number of copies of the card.
+        """
+        if self.__pending:
+            self.__running += self.__pending.popleft()
+        copies: int = 1 + self.__running
+
+        if matches:
+            self.points += 1 << (matches - 1)
+
+            # The next card is now at the front of the window
+            if len(self.__pending) < matches + 1:
+                self.__pending.extend([0] * (matches + 1 - len(self.__pending)))
+            self.__pending[0] += copies
+            self.__pending[matches] -= copies
+
+        self.num_cards += 1
+        self.total_copies += copies
+
+        return copies
+
+    def add_line(self, line: str) -> int:
+        """
+        Score the next card from its line.
+
+        Args:
+            line (str | bytes): The card line, e.g. "Card 1: 41 48 | 83 86 48".
+
+        Returns:
+            int: The number of copies of the card, or 0 for a blank line.
+        """
+        card: tuple[int, int] = tokenize_card(line.encode() if isinstance(line, str) else line)
+        if card is None:
+            return 0
+
+        return self.add_card(card[1])
+
+    def add_lines(self, lines: Iterable[str]) -> None:
+        """
+        Score several card lines in order.
+
+        Args:
+            lines (Iterable[str]): The card lines.
+        """
+        for line in lines:
+            self.add_line(line)
+
+    def checkpoint(self, file_path: str) -> None:
+        """
+        Save the scorer's state to a file.
+
+        The state is written as JSON next to its destination and then moved into
+        place, so an interrupted checkpoint never leaves a truncated file behind.
+
+        Args:
+            file_path (str): The path of the checkpoint file.
+        """
+        state: dict = dict(
+            num_cards=self.num_cards,
+            points=self.points,
+            total_copies=self.total_copies,
+            running=self.__running,
+            pending=list(self.__pending),
+        )
+
+        temporary_path: str = f"{file_path}.tmp"
+        with open(temporary_path, "w") as f:
+            json.dump(state, f)
+        os.replace(temporary_path, file_path)
+
+    @classmethod
+    def restore(cls, file_path: str) -> "IncrementalScorer":
+        """
+        Load a scorer from a checkpoint file.
+
+        Args:
+            file_path (str): The path of the checkpoint file.
+
+        Returns:
+            IncrementalScorer: The scorer, ready to accept the cards following the checkpoint.
+        """
+        with open(file_path, "r") as f:
+            state: dict = json.load(f)
+
+        scorer: IncrementalScorer = cls()
+        scorer.num_cards = state["num_cards"]
+        scorer.points = state["points"]
+        scorer.total_copies = state["total_copies"]
+        scorer.__running = state["running"]
+        scorer.__pending = deque(state["pending"])
+
+        return scorer
+
+
+def get_copy_counts(match_counts: [int], initial_copies: [int] = None) -> [int]:
+    """
+    Propagates won copies through the cards in linear time with a running difference array.
+
+    Each card adds its copy count to a range of later cards, which is recorded
+    as two updates at the range's ends instead of one update per card in it.
+    Counts are kept as Python ints because they grow exponentially with the
+    number of matches and quickly overflow fixed-width integers.
+
+    Parameters:
+    match_counts (list[int] | array): The match count of each card, ordered by card ID.
+    initial_copies (list[int], optional): The copies each card starts with. Defaults to one per card.
+
+    Returns:
+    list[int]: The final number of copies of each card.
+    """
+    num_cards: int = len(match_counts)
+    copies: [int] = list(initial_copies) if initial_copies is not None else [1] * num_cards
+    differences: [int] = [0] * (num_cards + 1)
+
+    running: int = 0
+    for i, matches in enumerate(match_counts):
+        running += differences[i]
+        copies[i] += running
+
+        if matches:
+            differences[i + 1] += copies[i]
+            differences[min(i + 1 + matches, num_cards)] -= copies[i]
+
+    return copies
+
+
+def get_copies(games: [Game], linear: bool = False) -> [Game]:
     """
     Returns a copy of the list of games with updated copies count for each game.
 
     Parameters:
     games (list[Game]): The list of games.
+    linear (bool): Whether to propagate copies with get_copy_counts, in linear time and
+        on new Game objects so the input games are left untouched. Defaults to False.
 
     Returns:
     list[Game]: A copy of the list of games with updated copies count for each game.
     """
+    if linear:
+        copy_counts: [int] = get_copy_counts(
+            [game.number_winning_played_games for game in games],
+            [game.copies for game in games],
+        )
+
+        games_copy: [Game] = []
+        for game, copies in zip(games, copy_counts):
+            game_copy: Game = copy(game)
+            game_copy.copies = copies
+            games_copy.append(game_copy)
+
+        return games_copy
 
     games_copy: [Game] = games.copy()
     for game in games_copy:
@@ -156,11 +576,14 @@ def get_checksum(games: [Game]) -> int:
     Calculates the checksum by summing up the points of all the games.
 
     Args:
-        games (list[Game]): A list of Game objects.
+        games (list[Game] | array): A list of Game objects, or the match count of each card.
 
     Returns:
         int: The checksum value.
     """
+    if isinstance(games, array):
+        return sum(1 << (matches - 1) for matches in games if matches)
+
     return sum(game.points for game in games)
 
 
@@ -169,23 +592,23 @@ def get_total_copies(games: [Game]) -> int:
     Calculates the total number of copies for a list of games.
 
     Args:
-        games (list[Game]): A list of Game objects representing different games.
+        games (list[Game] | array): A list of Game objects that went through get_copies,
+            or the match count of each card.
 
     Returns:
         int: The total number of copies for all the games.
     """
+    if isinstance(games, array):
+        return sum(get_copy_counts(games))
+
     return sum(game.copies for game in games)
 
 
 if __name__ == "__main__":
     test: bool = False
-    lines: [str] = utils.read_lines(FILENAME, test=test)
-    parsed_lines: [str] = parse_input(lines)
-
-    games: [Game] = extract_games(parsed_lines)
-    games_with_copies: [Game] = get_copies(games)
-    checksum_part_1: int = get_checksum(games)
-    checksum_part_2: int = get_total_copies(games_with_copies)
+    match_counts: array = CardTokenizer.from_file(FILENAME, test=test).match_counts
+    checksum_part_1: int = get_checksum(match_counts)
+    checksum_part_2: int = get_total_copies(match_counts)
 
     print(f"{checksum_part_1=}")
     print(f"{checksum_part_2=}")
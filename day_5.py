@@ -95,7 +95,294 @@ So, the lowest location number in this example is 35.
 What is the lowest location number that corresponds to any of the initial seed numbers?
 """
 
+from array import array
+from bisect import bisect_right
+from concurrent.futures import FIRST_COMPLETED, CancelledError, Future, ProcessPoolExecutor, wait
+from functools import partial
+from math import ceil, log2
+from multiprocessing.context import BaseContext
+from multiprocessing.shared_memory import SharedMemory
+from operator import add
+from threading import Event
+from typing import Callable, Iterator
 from utils import utils
+import os
+import struct
+
+# Upper bound of the values a PiecewiseMap covers, the largest value an array("q") can hold
+MAX_VALUE: int = (1 << 63) - 1
+# Number of values PiecewiseMap.iter_map_values maps at a time
+CHUNK_SIZE: int = 1 << 20
+
+
+class PiecewiseMap:
+    """
+    A function over the non-negative integers made of consecutive translated segments.
+
+    Segment i covers [starts[i], starts[i + 1]) (the last one extends up to
+    MAX_VALUE) and adds offsets[i] to every value in it. Gaps are explicit
+    segments with a zero offset, so every lookup is a single binary search.
+    """
+
+    def __init__(self, starts: array, offsets: array) -> None:
+        """
+        Initialize a PiecewiseMap object.
+
+        Args:
+            starts (array): The sorted segment starts, beginning at 0.
+            offsets (array): The offset added by each segment.
+        """
+        self.starts: array = starts
+        self.offsets: array = offsets
+
+    @classmethod
+    def identity(cls) -> "PiecewiseMap":
+        """
+        Get the map that sends every value to itself.
+
+        Returns:
+            PiecewiseMap: The identity map.
+        """
+        return cls(array("q", [0]), array("q", [0]))
+
+    @classmethod
+    def from_segments(cls, segments: [tuple[int, int]]) -> "PiecewiseMap":
+        """
+        Build a map from (start, offset) segments, merging neighbours with the same offset.
+
+        Args:
+            segments (list[tuple[int, int]]): The sorted (start, offset) segments, beginning at 0.
+
+        Returns:
+            PiecewiseMap: The map.
+        """
+        starts: array = array("q")
+        offsets: array = array("q")
+        for start, offset in segments:
+            if starts and starts[-1] == start:
+                starts.pop()
+                offsets.pop()
+            if offsets and offsets[-1] == offset:
+                continue
+
+            starts.append(start)
+            offsets.append(offset)
+
+        return cls(starts, offsets)
+
+    def __len__(self) -> int:
+        """
+        Get the number of segments.
+
+        Returns:
+            int: The number of segments.
+        """
+        return len(self.starts)
+
+    def __getitem__(self, value: int) -> int:
+        """
+        Map a single value.
+
+        Args:
+            value (int): The value.
+
+        Returns:
+            int: The mapped value.
+        """
+        return value + self.offsets[bisect_right(self.starts, value) - 1]
+
+    def get_buffer_size(self) -> int:
+        """
+        Get the number of bytes write_to_buffer needs.
+
+        Returns:
+            int: The size of the serialized map in bytes.
+        """
+        return self.starts.itemsize * (1 + 2 * len(self.starts))
+
+    def write_to_buffer(self, buffer: memoryview) -> None:
+        """
+        Write the map into a writable buffer, e.g. a block of shared memory.
+
+        The layout is the number of segments followed by the starts and the
+        offsets, all as native 64-bit integers.
+
+        Args:
+            buffer (memoryview): A buffer of at least get_buffer_size() bytes.
+        """
+        values: memoryview = buffer.cast("B").cast("q")
+        num_segments: int = len(self.starts)
+        values[0] = num_segments
+        values[1 : 1 + num_segments] = self.starts
+        values[1 + num_segments : 1 + 2 * num_segments] = self.offsets
+        values.release()
+
+    @classmethod
+    def from_buffer(cls, buffer: memoryview) -> "PiecewiseMap":
+        """
+        Build a read-only map that reads its segments straight from a buffer written by write_to_buffer.
+
+        Args:
+            buffer (memoryview): The buffer.
+
+        Returns:
+            PiecewiseMap: The map, sharing the buffer's memory.
+        """
+        # Read-only, so a worker sharing the block cannot corrupt the map for the others
+        values: memoryview = buffer.cast("B").cast("q").toreadonly()
+        num_segments: int = values[0]
+        return cls(values[1 : 1 + num_segments], values[1 + num_segments : 1 + 2 * num_segments])
+
+    def get_segment_stop(self, index: int) -> int:
+        """
+        Get the exclusive end of a segment.
+
+        Args:
+            index (int): The index of the segment.
+
+        Returns:
+            int: The start of the next segment, or MAX_VALUE for the last one.
+        """
+        if index + 1 < len(self.starts):
+            return self.starts[index + 1]
+
+        return MAX_VALUE
+
+    def then(self, other: "PiecewiseMap") -> "PiecewiseMap":
+        """
+        Compose this map with another one that is applied to its output.
+
+        Args:
+            other (PiecewiseMap): The map applied after this one.
+
+        Returns:
+            PiecewiseMap: The map equivalent to applying this map and then other.
+        """
+        segments: [tuple[int, int]] = []
+        for i, (start, offset) in enumerate(zip(self.starts, self.offsets)):
+            stop: int = self.get_segment_stop(i)
+
+            # Split the image of the segment at the other map's segment starts
+            j: int = bisect_right(other.starts, start + offset) - 1
+            while j < len(other.starts) and other.starts[j] < stop + offset:
+                segments.append((max(start, other.starts[j] - offset), offset + other.offsets[j]))
+                j += 1
+
+        return PiecewiseMap.from_segments(segments)
+
+    def __get_value_mapper(self):
+        """
+        Get a function that maps an iterable of values lazily.
+
+        The values go through a pipeline of map() calls over C functions (a
+        binary search, an offset lookup and an addition), so no Python code runs
+        per value. The segment columns are copied to lists first because
+        indexing lists avoids boxing a new int on every access.
+
+        Returns:
+            Callable[[Iterable[int]], Iterator[int]]: The mapper.
+        """
+        # Shift the offsets by one so the result of bisect_right indexes them directly
+        shifted_offsets: [int] = [0, *self.offsets]
+        find_segment = partial(bisect_right, list(self.starts))
+
+        return lambda values: map(add, values, map(shifted_offsets.__getitem__, map(find_segment, values)))
+
+    def iter_map_values(self, values: array, chunk_size: int = CHUNK_SIZE) -> Iterator[array]:
+        """
+        Map a batch of values chunk by chunk, so only one chunk of results is alive at a time.
+
+        Args:
+            values (array): The values to map, e.g. an array("q") of seeds.
+            chunk_size (int, optional): The number of values mapped at a time. Defaults to CHUNK_SIZE.
+
+        Yields:
+            array: The mapped values of each chunk, as an array("q").
+        """
+        mapper = self.__get_value_mapper()
+        for chunk_start in range(0, len(values), chunk_size):
+            yield array("q", mapper(values[chunk_start : chunk_start + chunk_size]))
+
+    def map_values(self, values: array, chunk_size: int = CHUNK_SIZE) -> array:
+        """
+        Map a batch of values.
+
+        Args:
+            values (array): The values to map, e.g. an array("q") of seeds.
+            chunk_size (int, optional): The number of values mapped at a time. Defaults to CHUNK_SIZE.
+
+        Returns:
+            array: The mapped values, as an array("q").
+        """
+        mapped_values: array = array("q")
+        for mapped_chunk in self.iter_map_values(values, chunk_size):
+            mapped_values.extend(mapped_chunk)
+
+        return mapped_values
+
+    def get_min_mapped_value(self, values: array) -> int:
+        """
+        Get the smallest value a batch of values maps to, without storing the mapped values.
+
+        Args:
+            values (array): The values to map, e.g. an array("q") of seeds.
+
+        Returns:
+            int: The smallest mapped value, or infinity if there are no values.
+        """
+        return min(self.__get_value_mapper()(values), default=float("inf"))
+
+    def map_intervals(self, intervals: [tuple[int, int]]) -> [tuple[int, int]]:
+        """
+        Map whole half-open intervals, splitting them at segment boundaries.
+
+        Args:
+            intervals (list[tuple[int, int]]): The (start, stop) intervals.
+
+        Returns:
+            list[tuple[int, int]]: The merged mapped intervals.
+        """
+        mapped_intervals: [tuple[int, int]] = []
+        for start, stop in intervals:
+            # Empty intervals hold no value, even though they sit inside a segment
+            if start >= stop:
+                continue
+
+            i: int = bisect_right(self.starts, start) - 1
+            while i < len(self.starts) and self.starts[i] < stop:
+                piece_start: int = max(start, self.starts[i])
+                piece_stop: int = min(stop, self.get_segment_stop(i))
+                mapped_intervals.append((piece_start + self.offsets[i], piece_stop + self.offsets[i]))
+                i += 1
+
+        return merge_intervals(mapped_intervals)
+
+    def get_min_value(self, intervals: [tuple[int, int]]) -> int:
+        """
+        Get the smallest value any of the half-open intervals maps to.
+
+        Only the first value of each overlapped segment can be the minimum, so
+        no interval needs to be materialized.
+
+        Args:
+            intervals (list[tuple[int, int]]): The (start, stop) intervals.
+
+        Returns:
+            int: The smallest mapped value, or infinity if the intervals are empty.
+        """
+        min_value: int = float("inf")
+        for start, stop in intervals:
+            # Empty intervals hold no value, even though they sit inside a segment
+            if start >= stop:
+                continue
+
+            i: int = bisect_right(self.starts, start) - 1
+            while i < len(self.starts) and self.starts[i] < stop:
+                min_value = min(min_value, max(start, self.starts[i]) + self.offsets[i])
+                i += 1
+
+        return min_value
+
 
 class SourceMap:
     def __init__(
@@ -115,11 +402,16 @@ class SourceMap:
         self.source_name: str = ""
         self.destination_name: str = ""
 
-        self.destination_ranges: list[range] = []
-        self.source_ranges: list[range] = []
-        self.length: list[int] = []
+        # Sorted segments covering [0, MAX_VALUE), gaps between ranges included with a zero delta;
+        # is_range tells the ranges of the input apart from the gaps, as a range may have a zero delta too
+        self.source_starts: array = array("q", [0])
+        self.lengths: array = array("q", [MAX_VALUE])
+        self.deltas: array = array("q", [0])
+        self.is_range: array = array("b", [0])
 
         self.destination_map: SourceMap = None
+        self.__compiled: PiecewiseMap = None
+        self.__compiled_inverse: PiecewiseMap = None
 
         self.__current_iter: self = None
         self._last: self = self
@@ -145,10 +437,105 @@ class SourceMap:
         destination_start, source_start, length = [
             int(num) for num in ranges_string.strip().split(" ")
         ]
-        self._last.destination_ranges.append(
-            range(destination_start, destination_start + length + 1)
-        )
-        self._last.source_ranges.append(range(source_start, source_start + length + 1))
+        self._last.__insert_segment(source_start, length, destination_start - source_start)
+        self.__compiled = None
+        self.__compiled_inverse = None
+
+    def __insert_segment(self, source_start: int, length: int, delta: int) -> None:
+        """
+        Carve a translated range out of the identity segment that contains it.
+
+        Args:
+            source_start (int): The first source value of the range.
+            length (int): The number of values in the range.
+            delta (int): The offset the range adds to its values.
+
+        Raises:
+            ValueError: If the range starts below 0, has a negative length or overlaps another range.
+        """
+        if source_start < 0 or length < 0:
+            raise ValueError(
+                f"Range of length {length} starting at {source_start} is invalid in "
+                + f"the {self.source_name}-to-{self.destination_name} map"
+            )
+        if not length:
+            return
+
+        i: int = bisect_right(self.source_starts, source_start) - 1
+        gap_start: int = self.source_starts[i]
+        gap_stop: int = gap_start + self.lengths[i]
+        if self.is_range[i] or source_start + length > gap_stop:
+            raise ValueError(
+                f"Range [{source_start}, {source_start + length}) overlaps another range of "
+                + f"the {self.source_name}-to-{self.destination_name} map"
+            )
+
+        segments: [tuple[int, int, int, int]] = [
+            (gap_start, source_start - gap_start, 0, 0),
+            (source_start, length, delta, 1),
+            (source_start + length, gap_stop - source_start - length, 0, 0),
+        ]
+        segments = [segment for segment in segments if segment[1]]
+
+        # Build every column first, so a value that does not fit leaves the map untouched
+        source_starts: array = array("q", [segment[0] for segment in segments])
+        lengths: array = array("q", [segment[1] for segment in segments])
+        deltas: array = array("q", [segment[2] for segment in segments])
+        is_range: array = array("b", [segment[3] for segment in segments])
+
+        self.source_starts[i : i + 1] = source_starts
+        self.lengths[i : i + 1] = lengths
+        self.deltas[i : i + 1] = deltas
+        self.is_range[i : i + 1] = is_range
+
+    @property
+    def source_ranges(self) -> list[range]:
+        """
+        Get the source ranges of the map.
+
+        Returns:
+            list[range]: The source range of each range of the map, sorted by start.
+        """
+        return [
+            range(start, start + length)
+            for start, length, is_range in zip(self.source_starts, self.lengths, self.is_range)
+            if is_range
+        ]
+
+    @property
+    def destination_ranges(self) -> list[range]:
+        """
+        Get the destination ranges of the map.
+
+        Returns:
+            list[range]: The destination range of each range of the map, sorted by source start.
+        """
+        return [
+            range(start + delta, start + delta + length)
+            for start, length, delta, is_range in zip(self.source_starts, self.lengths, self.deltas, self.is_range)
+            if is_range
+        ]
+
+    def get_stage_map(self) -> PiecewiseMap:
+        """
+        Get this map alone, without the maps after it, as a PiecewiseMap.
+
+        Returns:
+            PiecewiseMap: The map from this map's source space to its destination space.
+        """
+        return PiecewiseMap.from_segments(zip(self.source_starts, self.deltas))
+
+    def map_value(self, value: int) -> int:
+        """
+        Map a single value through this map only, with a binary search over the segments.
+
+        Args:
+            value (int): The value in this map's source space.
+
+        Returns:
+            int: The value in this map's destination space.
+        """
+        return value + self.deltas[bisect_right(self.source_starts, value) - 1]
 
     def add_map(self, map_name_string: str):
         """
@@ -171,49 +558,129 @@ class SourceMap:
         )
 
         self._last = this_map.destination_map
+        self.__compiled = None
+        self.__compiled_inverse = None
 
-    def __range_intersection(self, range_1: range, range_2: range) -> range:
+    def get_range_maps(self) -> [tuple[int, int, int]]:
         """
-        Find the intersection of two ranges.
+        Get the ranges of this map as half-open source intervals with the offset they add.
 
-        Args:
-            range_1 (range): The first range.
-            range_2 (range): The second range.
+        Returns:
+            list[tuple[int, int, int]]: The (source_start, source_stop, offset) of each range, sorted by source_start.
+        """
+        return [
+            (start, start + length, delta)
+            for start, length, delta, is_range in zip(self.source_starts, self.lengths, self.deltas, self.is_range)
+            if is_range
+        ]
+
+    def compile(self) -> PiecewiseMap:
+        """
+        Compose this map and every map after it into a single PiecewiseMap.
+
+        The composition is computed once and reused until more ranges or maps
+        are added, so every later lookup is a single binary search.
+
+        Returns:
+            PiecewiseMap: The map from this map's source space to the last map's destination space.
+        """
+        if self.__compiled is None:
+            compiled: PiecewiseMap = PiecewiseMap.identity()
+            source_map: SourceMap = self
+            while source_map is not None:
+                compiled = compiled.then(source_map.get_stage_map())
+                source_map = source_map.destination_map
+
+            self.__compiled = compiled
+
+        return self.__compiled
+
+    def invert(self) -> "SourceMap":
+        """
+        Build the inverse chain, from the last map's destination back to this map's source.
+
+        A map can only be inverted when it is a bijection, i.e. its destination
+        ranges cover exactly the same values as its source ranges; otherwise the
+        values outside the ranges would not map back to themselves.
+
+        Returns:
+            SourceMap: The first map of the inverse chain.
+
+        Raises:
+            ValueError: If one of the maps is not a bijection.
+        """
+        inverse_map: SourceMap = None
+        source_map: SourceMap = self
+        while source_map is not None:
+            range_maps: [tuple[int, int, int]] = source_map.get_range_maps()
+            sources: [tuple[int, int]] = merge_intervals([(start, stop) for start, stop, _ in range_maps])
+            destinations: [tuple[int, int]] = merge_intervals(
+                [(start + delta, stop + delta) for start, stop, delta in range_maps]
+            )
+            if sources != destinations:
+                raise ValueError(
+                    f"The {source_map.source_name}-to-{source_map.destination_name} map is not invertible"
+                )
+
+            stage: SourceMap = SourceMap(
+                source_name=source_map.destination_name, destination_name=source_map.source_name
+            )
+            for start, stop, delta in range_maps:
+                stage.__insert_segment(start + delta, stop - start, -delta)
+
+            stage.destination_map = inverse_map
+            inverse_map = stage
+            source_map = source_map.destination_map
+
+        return inverse_map
+
+    def compile_inverse(self) -> PiecewiseMap:
+        """
+        Compile the inverse chain into a single PiecewiseMap, once.
 
         Returns:
-            range: The intersection of the two ranges, or None if there is no intersection.
+            PiecewiseMap: The map from the last map's destination space back to this map's source space.
+
+        Raises:
+            ValueError: If one of the maps is not a bijection.
         """
-        max_start: int = max(range_1.start, range_2.start)
-        min_end: int = min(range_1.stop, range_2.stop)
-        return range(max_start, min_end) or None
+        if self.__compiled_inverse is None:
+            self.__compiled_inverse = self.invert().compile()
 
-    def __get_minimum_index_in_range(self, range_start: int, range_length: int):
+        return self.__compiled_inverse
+
+    def map_intervals(self, intervals: [tuple[int, int]]) -> [tuple[int, int]]:
         """
-        Get the minimum index within a given range.
+        Map whole half-open intervals through this map only.
+
+        Every interval is split at the boundaries of the ranges it overlaps, and
+        each piece is shifted as a block, so the cost depends on the number of
+        intervals and ranges rather than on the number of values they cover.
 
         Args:
-            range_start (int): The start of the range.
-            range_length (int): The length of the range.
+            intervals (list[tuple[int, int]]): The (start, stop) intervals in this map's source space.
 
         Returns:
-            int: The minimum index within the range, or None if no intersection is found.
+            list[tuple[int, int]]: The merged intervals in this map's destination space.
         """
-        _range: range = range(range_start, range_start + range_length)
-        min_index: int = float("inf")
+        return self.get_stage_map().map_intervals(intervals)
 
-        found_intersection: bool = False
-        for source_range in self.source_ranges:
-            range_intersection: range = self.__range_intersection(_range, source_range)
+    def get_location_intervals(self, intervals: [tuple[int, int]]) -> [tuple[int, int]]:
+        """
+        Push whole half-open intervals through this map and every map after it.
 
-            if range_intersection:
-                found_intersection = True
-                min_index = min(min_index, range_intersection.start)
-                break
+        Args:
+            intervals (list[tuple[int, int]]): The (start, stop) intervals in this map's source space.
 
-        if not found_intersection:
-            return None
+        Returns:
+            list[tuple[int, int]]: The merged intervals in the last map's destination space.
+        """
+        source_map: SourceMap = self
+        while source_map is not None:
+            intervals = source_map.map_intervals(intervals)
+            source_map = source_map.destination_map
 
-        return min_index
+        return intervals
 
     def __get_location_by_index(self, index: int) -> int:
         """
@@ -225,51 +692,98 @@ class SourceMap:
         Returns:
             int: The location corresponding to the index.
         """
-        found: bool = False
         output: int = index
-        for i, map_range in enumerate(self.source_ranges):
-            if index in map_range:
-                found = True
-                offset: int = index - map_range.start
-                output_index = self.destination_ranges[i].start + (offset)
-                if self.destination_map:
-                    output = self.destination_map[output_index]
-                break
-
-        if not found:
-            if self.destination_map:
-                output = self.destination_map[index]
-
-        if not self.destination_map:
-            for i, map_range in enumerate(self.source_ranges):
-                if output in map_range:
-                    found = True
-                    offset: int = output - map_range.start
-                    output = self.destination_ranges[i].start + (offset)
-                    break
+        source_map: SourceMap = self
+        while source_map is not None:
+            output = source_map.map_value(output)
+            source_map = source_map.destination_map
 
         return output
 
+    def to_bytes(self) -> bytes:
+        """
+        Serialize this map and every map after it.
+
+        Each map is written as a small header followed by the raw bytes of its
+        segment columns, in native byte order.
+
+        Returns:
+            bytes: The serialized maps.
+        """
+        chunks: [bytes] = []
+        source_map: SourceMap = self
+        while source_map is not None:
+            names: bytes = f"{source_map.source_name}-to-{source_map.destination_name}".encode()
+            chunks.append(struct.pack("<II", len(names), len(source_map.source_starts)))
+            chunks.append(names)
+            chunks.append(source_map.source_starts.tobytes())
+            chunks.append(source_map.lengths.tobytes())
+            chunks.append(source_map.deltas.tobytes())
+            chunks.append(source_map.is_range.tobytes())
+            source_map = source_map.destination_map
+
+        return b"".join(chunks)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SourceMap":
+        """
+        Deserialize maps written by to_bytes.
+
+        Args:
+            data (bytes): The serialized maps.
+
+        Returns:
+            SourceMap: The first map of the chain.
+        """
+        head: SourceMap = None
+        previous: SourceMap = None
+        offset: int = 0
+        while offset < len(data):
+            names_length, num_segments = struct.unpack_from("<II", data, offset)
+            offset += struct.calcsize("<II")
+
+            source_map: SourceMap = cls(data[offset : offset + names_length].decode())
+            offset += names_length
+
+            columns: [array] = []
+            for typecode in "qqqb":
+                column: array = array(typecode)
+                column.frombytes(data[offset : offset + num_segments * column.itemsize])
+                offset += num_segments * column.itemsize
+                columns.append(column)
+            source_map.source_starts, source_map.lengths, source_map.deltas, source_map.is_range = columns
+
+            if previous is None:
+                head = source_map
+            else:
+                previous.destination_map = source_map
+            previous = source_map
+
+        if head is not None:
+            head._last = previous
+        return head
+
     def __getitem__(self, key: int) -> int:
         """
         Get the location by index or range.
 
         Args:
-            key (int or slice): The index or range.
+            key (int or slice): The index, or a slice whose start is the first index and whose stop is the length of the range.
 
         Returns:
-            int: The location corresponding to the index or range.
+            int: The location corresponding to the index, or the minimum location over the range.
         """
         if isinstance(key, int):
             return self.__get_location_by_index(key)
         elif isinstance(key, slice):
             range_start: int = key.start
-            range_length: int = key.stop - 1
-            index: int = self.__get_minimum_index_in_range(range_start, range_length)
+            range_length: int = key.stop
+            location_intervals: [tuple[int, int]] = self.get_location_intervals(
+                [(range_start, range_start + range_length)]
+            )
 
-            if index:
-                output: int = self.__getitem__(index)
-                return output
+            if location_intervals:
+                return location_intervals[0][0]
 
     @staticmethod
     def __parse_map_name(map_name_string: str) -> [str, str]:
@@ -338,6 +852,42 @@ class SourceMap:
         """
         return self.__repr__()
 
+def merge_intervals(intervals: [tuple[int, int]]) -> [tuple[int, int]]:
+    """
+    Sort half-open intervals and merge the ones that overlap or touch.
+
+    Args:
+        intervals (list[tuple[int, int]]): The (start, stop) intervals.
+
+    Returns:
+        list[tuple[int, int]]: The sorted, disjoint intervals.
+    """
+    merged_intervals: [tuple[int, int]] = []
+    for start, stop in sorted(intervals):
+        if start >= stop:
+            continue
+
+        if merged_intervals and start <= merged_intervals[-1][1]:
+            merged_intervals[-1] = (merged_intervals[-1][0], max(merged_intervals[-1][1], stop))
+        else:
+            merged_intervals.append((start, stop))
+
+    return merged_intervals
+
+
+def get_seed_intervals(seeds: [int]) -> [tuple[int, int]]:
+    """
+    Pair up the seed numbers into half-open seed intervals.
+
+    Args:
+        seeds (list[int]): Alternating seed range starts and lengths.
+
+    Returns:
+        list[tuple[int, int]]: The (start, stop) interval of each seed range.
+    """
+    return [(seeds[i - 1], seeds[i - 1] + seeds[i]) for i in range(1, len(seeds), 2)]
+
+
 def parse_lines(lines: [str]) -> [int, SourceMap]:
     """
     Parses the input lines and returns a tuple containing the seed numbers and the source map.
@@ -368,14 +918,78 @@ def parse_lines(lines: [str]) -> [int, SourceMap]:
     return seed_numbers, source_map
 
 
-def get_min_location(seeds: [int], source_map: SourceMap, seed_ranges=False) -> int:
+def get_min_location_reverse(seed_intervals: [tuple[int, int]], source_map: SourceMap) -> int:
+    """
+    Returns the minimum location of the seed intervals by walking locations upwards through the inverse maps.
+
+    The segments of the compiled inverse map are already sorted by location, and
+    each one maps a whole interval of locations back to an interval of seeds.
+    The first segment whose seeds intersect a seed interval holds the answer,
+    so the walk stops there instead of mapping every seed interval forward.
+
+    Args:
+        seed_intervals (list[tuple[int, int]]): The (start, stop) seed intervals.
+        source_map (SourceMap): The first map of the chain. Every map must be a bijection.
+
+    Returns:
+        int: The minimum location value.
+    """
+    inverse_map: PiecewiseMap = source_map.compile_inverse()
+    seed_intervals = merge_intervals(seed_intervals)
+    seed_stops: [int] = [stop for _, stop in seed_intervals]
+
+    for i, (location_start, offset) in enumerate(zip(inverse_map.starts, inverse_map.offsets)):
+        seed_start: int = location_start + offset
+        seed_stop: int = inverse_map.get_segment_stop(i) + offset
+
+        # First seed interval ending after the segment's first seed
+        j: int = bisect_right(seed_stops, seed_start)
+        if j < len(seed_intervals) and seed_intervals[j][0] < seed_stop:
+            return max(seed_start, seed_intervals[j][0]) - offset
+
+    return float("inf")
+
+
+def choose_strategy(seed_intervals: [tuple[int, int]], source_map: SourceMap) -> str:
+    """
+    Choose between the forward and reverse seed range solvers from a cost estimate.
+
+    The forward solver binary-searches every seed interval in the compiled map,
+    while the reverse solver, in the worst case, binary-searches the seed
+    intervals for every segment of the compiled inverse map. Maps that are not
+    bijections can only be solved forward.
+
+    Args:
+        seed_intervals (list[tuple[int, int]]): The (start, stop) seed intervals.
+        source_map (SourceMap): The first map of the chain.
+
+    Returns:
+        str: "forward" or "reverse".
+    """
+    try:
+        num_inverse_segments: int = len(source_map.compile_inverse())
+    except ValueError:
+        return "forward"
+
+    num_segments: int = len(source_map.compile())
+    forward_cost: float = len(seed_intervals) * log2(num_segments + 1)
+    reverse_cost: float = num_inverse_segments * log2(len(seed_intervals) + 1)
+
+    return "reverse" if reverse_cost < forward_cost else "forward"
+
+
+def get_min_location(seeds: [int], source_map: SourceMap, seed_ranges=False, strategy: str = "auto") -> int:
     """
     Returns the minimum location value from the given seeds and source map.
 
     Args:
         seeds (List[int]): A list of seed values.
-        source_map (SourceMap): A mapping of locations to values.
+        source_map (SourceMap): A mapping of locations to values. It is compiled on first use and the
+            compiled map is reused by later calls.
         seed_ranges (bool, optional): Indicates whether the seeds represent ranges. Defaults to False.
+        strategy (str, optional): How seed ranges are solved: "forward" maps them through the compiled map,
+            "reverse" walks locations upwards through the inverse maps and "auto" picks one with
+            choose_strategy. Defaults to "auto".
 
     Returns:
         int: The minimum location value.
@@ -384,17 +998,165 @@ def get_min_location(seeds: [int], source_map: SourceMap, seed_ranges=False) ->
     min_location: int = float("inf")
 
     if seed_ranges:
-        for i in range(1, len(seeds), 2):
-            seed_range_start: int = 0
-            seed_range_length: int = 0
-            seed_range_start, seed_range_length = seeds[i - 1], seeds[i]
-            location: int = source_map[seed_range_start:seed_range_length]
-            min_location = min(min_location, location)
+        seed_intervals: [tuple[int, int]] = get_seed_intervals(seeds)
+        if strategy == "auto":
+            strategy = choose_strategy(seed_intervals, source_map)
+
+        if strategy == "reverse":
+            min_location = get_min_location_reverse(seed_intervals, source_map)
+        elif strategy == "forward":
+            min_location = source_map.compile().get_min_value(seed_intervals)
+        else:
+            raise ValueError(f"Unknown strategy {strategy!r}")
 
     else:
-        for seed in seeds:
-            location: int = source_map[seed]
-            min_location = min(min_location, location)
+        min_location = source_map.compile().get_min_mapped_value(array("q", seeds))
+
+    return min_location
+
+
+def split_seed_intervals(seed_intervals: [tuple[int, int]], num_shards: int) -> [[tuple[int, int]]]:
+    """
+    Split seed intervals into shards that cover about the same number of seeds.
+
+    Intervals are cut where a shard fills up, so one huge seed range is spread
+    over several shards instead of landing on a single worker.
+
+    Args:
+        seed_intervals (list[tuple[int, int]]): The (start, stop) seed intervals.
+        num_shards (int): The number of shards to aim for.
+
+    Returns:
+        list[list[tuple[int, int]]]: The intervals of each non-empty shard.
+    """
+    seed_intervals = merge_intervals(seed_intervals)
+    total_seeds: int = sum(stop - start for start, stop in seed_intervals)
+    shard_size: int = max(ceil(total_seeds / max(num_shards, 1)), 1)
+
+    shards: [[tuple[int, int]]] = [[]]
+    remaining: int = shard_size
+    for start, stop in seed_intervals:
+        while start < stop:
+            if not remaining:
+                shards.append([])
+                remaining = shard_size
+
+            piece_stop: int = min(stop, start + remaining)
+            shards[-1].append((start, piece_stop))
+            remaining -= piece_stop - start
+            start = piece_stop
+
+    return [shard for shard in shards if shard]
+
+
+# Compiled map each worker process reads from shared memory, set by init_shard_worker
+shared_map: PiecewiseMap = None
+shared_memory: SharedMemory = None
+
+
+def init_shard_worker(shared_memory_name: str) -> None:
+    """
+    Attach a worker process to the shared compiled map.
+
+    Args:
+        shared_memory_name (str): The name of the shared memory block holding the map.
+    """
+    global shared_map, shared_memory
+    # Workers share the parent's resource tracker with every start method (fork inherits it,
+    # spawn and forkserver are handed its pipe), so attaching only re-adds the parent's
+    # registration; unregistering here would make the parent's unlink fail in the tracker
+    shared_memory = SharedMemory(shared_memory_name)
+    shared_map = PiecewiseMap.from_buffer(shared_memory.buf)
+
+
+def get_shard_min_location(shard: [tuple[int, int]]) -> int:
+    """
+    Get the minimum location of a shard of seed intervals from the shared compiled map.
+
+    Args:
+        shard (list[tuple[int, int]]): The (start, stop) seed intervals of the shard.
+
+    Returns:
+        int: The minimum location of the shard.
+    """
+    return shared_map.get_min_value(shard)
+
+
+def get_min_location_parallel(
+    seeds: [int],
+    source_map: SourceMap,
+    num_workers: int = None,
+    num_shards: int = None,
+    progress: Callable[[int, int], None] = None,
+    cancel_event: Event = None,
+    mp_context: BaseContext = None,
+) -> int:
+    """
+    Returns the minimum location of the seed ranges by evaluating balanced shards in a process pool.
+
+    The chain is compiled once and its segments are copied into a block of
+    shared memory that every worker maps read-only, so only the shard
+    intervals are sent with each task.
+
+    Args:
+        seeds (List[int]): Alternating seed range starts and lengths.
+        source_map (SourceMap): The first map of the chain.
+        num_workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+        num_shards (int, optional): The number of shards. Defaults to four per worker.
+        progress (Callable[[int, int], None], optional): Called with the number of finished shards and the
+            total number of shards whenever a shard finishes.
+        cancel_event (Event, optional): Checked before any shard is submitted and again whenever a shard
+            finishes. Once it is set, no further shards are submitted, the shards already running are
+            waited for, as a worker process cannot be interrupted mid-shard, and CancelledError is raised.
+        mp_context (BaseContext, optional): The multiprocessing context that starts the workers.
+            Defaults to the platform's default start method.
+
+    Returns:
+        int: The minimum location value.
+
+    Raises:
+        CancelledError: If cancel_event was set before every shard finished, including before the first one.
+    """
+    num_workers = num_workers or os.cpu_count() or 1
+    shards: [[tuple[int, int]]] = split_seed_intervals(
+        get_seed_intervals(seeds), num_shards or 4 * num_workers
+    )
+
+    compiled_map: PiecewiseMap = source_map.compile()
+    block: SharedMemory = SharedMemory(create=True, size=compiled_map.get_buffer_size())
+    min_location: int = float("inf")
+
+    try:
+        compiled_map.write_to_buffer(block.buf)
+
+        with ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=mp_context,
+            initializer=init_shard_worker,
+            initargs=(block.name,),
+        ) as executor:
+            running: set[Future] = set()
+            submitted: int = 0
+            finished: int = 0
+
+            while finished < len(shards):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise CancelledError(f"Cancelled after {finished} of {len(shards)} shards")
+
+                # Only keep one shard per worker in flight, so the event is checked before every submission
+                while submitted < len(shards) and len(running) < num_workers:
+                    running.add(executor.submit(get_shard_min_location, shards[submitted]))
+                    submitted += 1
+
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    min_location = min(min_location, future.result())
+                    finished += 1
+                    if progress is not None:
+                        progress(finished, len(shards))
+    finally:
+        block.close()
+        block.unlink()
 
     return min_location
 
@@ -408,4 +1170,6 @@ if __name__ == "__main__":
 
     seeds, source_map = parse_lines(lines)
     min_location: int = get_min_location(seeds, source_map)
-    min_location: int = get_min_location(seeds, source_map, seed_ranges=True)
+    print(f"{min_location=}")
+    min_location_seed_ranges: int = get_min_location(seeds, source_map, seed_ranges=True)
+    print(f"{min_location_seed_ranges=}")
@@ -41,9 +41,21 @@ To see how much margin of error you have, determine the number of ways you can b
 Determine the number of ways you could beat the record in each race. What do you get if you multiply these numbers together?
 """
 from utils import utils
-from math import floor, ceil
+from itertools import repeat, tee
+from math import floor, ceil, isqrt, prod
+from operator import and_, gt, itemgetter, methodcaller, mul, sub, xor
+from typing import Iterator
+import mmap
 import re
 
+NUMBER_PATTERN: re.Pattern = re.compile(rb"\d+")
+# A Time line followed, possibly after blank lines, by its Distance line
+SHEET_PATTERN: re.Pattern = re.compile(rb"Time:([^\n]*)\n\s*Distance:([^\n]*)")
+NON_DIGITS: bytes = bytes(byte for byte in range(256) if byte not in b"0123456789")
+GROUP: methodcaller = methodcaller("group")
+# Stays below the default limit of sys.get_int_max_str_digits()
+MAX_INT_DIGITS: int = 4000
+
 
 def solve_quadratic_equation(a: int, b: int, c: int) -> float:
     """
@@ -104,6 +116,86 @@ def calculate_displacement_bounds(
     return min_bound, max_bound
 
 
+def calculate_exact_displacement_bounds(max_time: int, target_displacement: int) -> [int, int]:
+    """
+    Calculates the range of hold times that beat the target displacement using only integer arithmetic.
+
+    Holding the button for h milliseconds covers h * (max_time - h), so the
+    winning hold times lie strictly between the roots of
+    h^2 - max_time * h + target_displacement = 0. The lower root is found with
+    math.isqrt and nudged to the first winning integer; the upper bound follows
+    by symmetry. No floats are involved, so the bounds are exact for
+    arbitrarily large races.
+
+    Args:
+        max_time (int): The maximum time.
+        target_displacement (int): The target displacement.
+
+    Returns:
+        Tuple[int, int]: The minimum and maximum winning hold times. If no hold time wins,
+            the maximum is one less than the minimum.
+    """
+    discriminant: int = max_time * max_time - 4 * target_displacement
+    half_time: int = max_time // 2
+    if discriminant < 0:
+        return half_time + 1, half_time
+
+    min_bound: int = max((max_time - isqrt(discriminant)) // 2, 0)
+
+    # The truncated square root leaves the bound at most a step or two away
+    while min_bound <= half_time and min_bound * (max_time - min_bound) <= target_displacement:
+        min_bound += 1
+    while min_bound > 0 and (min_bound - 1) * (max_time - min_bound + 1) > target_displacement:
+        min_bound -= 1
+
+    max_bound: int = max_time - min_bound
+    if max_bound < min_bound:
+        return min_bound, min_bound - 1
+
+    return min_bound, max_bound
+
+
+def get_win_window_widths(times: [int], distances: [int]) -> [int]:
+    """
+    Calculates the number of winning hold times of many races at once.
+
+    A hold time h wins when h * (time - h) > distance, i.e. when
+    k = |2h - time| satisfies k^2 < time^2 - 4 * distance. The winning k are the
+    integers up to m = min(isqrt(discriminant - 1), time) with the same parity as time, so
+    each width is m + 1, minus one when m and time have different parities.
+    Every step is a map() over C functions applied to the whole batch, and the
+    integer arithmetic stays exact for values of any size.
+
+    Args:
+        times (list[int]): The time of each race, e.g. an array("q").
+        distances (list[int]): The record distance of each race.
+
+    Returns:
+        list[int]: The number of winning hold times of each race.
+    """
+    discriminants: [int] = list(map(sub, map(mul, times, times), map(mul, distances, repeat(4))))
+    # Hold times never exceed the race time, so neither does k
+    roots: [int] = list(map(min, map(isqrt, map(max, map(sub, discriminants, repeat(1)), repeat(0))), times))
+
+    widths = map(sub, map(sub, roots, repeat(-1)), map(and_, map(xor, roots, times), repeat(1)))
+    # Races without a positive discriminant cannot be won
+    return list(map(mul, widths, map(gt, discriminants, repeat(0))))
+
+
+def calculate_batch_margin_of_error(times: [int], distances: [int]) -> int:
+    """
+    Calculates the margin of error of many races given as parallel columns.
+
+    Args:
+        times (list[int]): The time of each race, e.g. an array("q").
+        distances (list[int]): The record distance of each race.
+
+    Returns:
+        int: The product of the number of winning hold times of every race.
+    """
+    return prod(get_win_window_widths(times, distances))
+
+
 def calculate_margin_of_error(races: [[int, int]]):
     """
     Calculates the margin of error for a list of races.
@@ -118,7 +210,7 @@ def calculate_margin_of_error(races: [[int, int]]):
     margin_of_error: int = 1
 
     for max_time, target_displacement in races:
-        bounds: [int, int] = calculate_displacement_bounds(
+        bounds: [int, int] = calculate_exact_displacement_bounds(
             max_time, target_displacement
         )
         bound_width: int = bounds[1] - bounds[0] + 1
@@ -152,23 +244,188 @@ def parse_lines(lines: [str], adjusted_for_bad_kerning=False) -> [[int, int]]:
     return list(zip(times, distances))
 
 
+def parse_digits(digits: bytes) -> int:
+    """
+    Converts a string of decimal digits of any length to an integer.
+
+    Long strings are split in half and combined with a power of ten, so the
+    conversion neither hits the interpreter's digit limit nor goes quadratic.
+
+    Args:
+        digits (bytes): The decimal digits, e.g. b"71530".
+
+    Returns:
+        int: The value of the digits, 0 if there are none.
+    """
+    if len(digits) <= MAX_INT_DIGITS:
+        return int(digits) if digits else 0
+
+    split: int = len(digits) // 2
+    return parse_digits(digits[:split]) * 10 ** (len(digits) - split) + parse_digits(digits[split:])
+
+
+def iter_column_values(buffer: bytes, span: [int, int], digits: bytearray) -> Iterator[int]:
+    """
+    Lazily converts the columns of one sheet line to ints while appending their digits to a buffer.
+
+    Both branches of the itertools.tee are advanced together by zip, so the tee
+    never holds more than the current token.
+
+    Args:
+        buffer (bytes): The buffer holding the line, e.g. an mmap.
+        span (tuple[int, int]): The start and end of the columns in the buffer.
+        digits (bytearray): The buffer the digits of every column are appended to.
+
+    Returns:
+        Iterator[int]: The value of each column.
+    """
+    tokens, kept_tokens = tee(map(GROUP, NUMBER_PATTERN.finditer(buffer, *span)))
+    return map(itemgetter(0), zip(map(int, tokens), map(digits.extend, kept_tokens)))
+
+
+class RaceSheet:
+    """
+    A lazy view of one Time/Distance sheet inside a larger buffer.
+
+    Iterating pairs the n-th Time column with the n-th Distance column as both
+    lines are scanned, so no list of columns is ever built. iter_races_with_kerning
+    reads both ways in one scan: it pairs the columns and keeps their digits for
+    the race read with bad kerning.
+    """
+
+    __slots__ = ("buffer", "time_span", "distance_span", "__kerned_race")
+
+    def __init__(self, buffer: bytes, time_span: [int, int], distance_span: [int, int]) -> None:
+        """
+        Initialize a RaceSheet object.
+
+        Args:
+            buffer (bytes): The buffer holding the sheet, e.g. an mmap. Any bytes-like object works.
+            time_span (tuple[int, int]): The start and end of the Time columns in the buffer.
+            distance_span (tuple[int, int]): The start and end of the Distance columns in the buffer.
+        """
+        self.buffer: bytes = buffer
+        self.time_span: [int, int] = time_span
+        self.distance_span: [int, int] = distance_span
+        self.__kerned_race: [int, int] = None
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        """
+        Lazily pairs the time and record distance of each race of the sheet.
+
+        Raises:
+            ValueError: While iterating, if the sheet has a different number of Time and Distance columns.
+
+        Returns:
+            Iterator[tuple[int, int]]: The time and record distance of each race.
+        """
+        times: Iterator[int] = map(int, map(GROUP, NUMBER_PATTERN.finditer(self.buffer, *self.time_span)))
+        distances: Iterator[int] = map(int, map(GROUP, NUMBER_PATTERN.finditer(self.buffer, *self.distance_span)))
+        return zip(times, distances, strict=True)
+
+    def iter_races_with_kerning(self) -> Iterator[tuple[int, int]]:
+        """
+        Lazily pairs the races of the sheet and reads the race with bad kerning in the same scan.
+
+        Every column token is converted to an int and appended to one digit
+        buffer per line as it is matched; once the columns are exhausted the
+        race read with bad kerning is available from kerned_race.
+
+        Raises:
+            ValueError: If the sheet has a different number of Time and Distance columns.
+
+        Yields:
+            tuple[int, int]: The time and record distance of each race.
+        """
+        self.__kerned_race = None
+        time_digits: bytearray = bytearray()
+        distance_digits: bytearray = bytearray()
+        times: Iterator[int] = iter_column_values(self.buffer, self.time_span, time_digits)
+        distances: Iterator[int] = iter_column_values(self.buffer, self.distance_span, distance_digits)
+
+        yield from zip(times, distances, strict=True)
+        self.__kerned_race = parse_digits(bytes(time_digits)), parse_digits(bytes(distance_digits))
+
+    @property
+    def kerned_race(self) -> [int, int]:
+        """
+        Returns the race read with bad kerning, where each line is one number.
+
+        The race collected by a finished iter_races_with_kerning is returned as is;
+        otherwise the non-digit bytes of both lines are deleted in a separate pass.
+
+        Returns:
+            tuple[int, int]: The time and record distance of the race.
+        """
+        if self.__kerned_race is not None:
+            return self.__kerned_race
+
+        time_digits: bytes = self.buffer[slice(*self.time_span)].translate(None, NON_DIGITS)
+        distance_digits: bytes = self.buffer[slice(*self.distance_span)].translate(None, NON_DIGITS)
+        return parse_digits(time_digits), parse_digits(distance_digits)
+
+    def races(self, adjusted_for_bad_kerning: bool = False) -> [[int, int]]:
+        """
+        Returns the races of the sheet, as parse_lines would.
+
+        Args:
+            adjusted_for_bad_kerning (bool, optional): Whether to read the sheet with bad kerning. Defaults to False.
+
+        Returns:
+            list[tuple[int, int]]: The time and record distance of each race.
+        """
+        if adjusted_for_bad_kerning:
+            return [self.kerned_race]
+        return list(self)
+
+
+def iter_race_sheets(file_name: str, data_dir_path: str = "./data", test: bool = False) -> Iterator[RaceSheet]:
+    """
+    Lazily yields every Time/Distance sheet of an input file.
+
+    The file is memory-mapped and each sheet is scanned in place, so sheets with
+    hundreds of thousands of columns are never read into Python lists. The
+    mapping is released once no sheet or column scan refers to it any more,
+    so sheets stay readable after the next one has been requested.
+
+    Args:
+        file_name (str): The name of the input file.
+        data_dir_path (str, optional): The data directory. Defaults to "./data".
+        test (bool, optional): Whether to read from the test data directory. Defaults to False.
+
+    Yields:
+        RaceSheet: Each sheet of the file, in order.
+    """
+    file_path: str = utils.get_file_path(file_name, data_dir_path, test)
+
+    with open(file_path, "rb") as f:
+        # Empty files cannot be memory-mapped
+        if not f.seek(0, 2):
+            return
+
+        # Not closed explicitly: a column scan interrupted by an error still holds the buffer
+        buffer: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    for match in SHEET_PATTERN.finditer(buffer):
+        yield RaceSheet(buffer, match.span(1), match.span(2))
+
+
 if __name__ == "__main__":
     test: bool = False
-    lines: [str] = utils.read_lines("day_6-data.txt", test=test)
 
-    races_with_bad_kerning: [[int, int]] = parse_lines(lines)
-    print(f"{races_with_bad_kerning=}")
-    races_without_bad_kerning: [[int, int]] = parse_lines(
-        lines, adjusted_for_bad_kerning=True
-    )
-    print(f"{races_without_bad_kerning=}")
+    # Both readings of each sheet come out of a single scan over its columns
+    for sheet in iter_race_sheets("day_6-data.txt", test=test):
+        races_with_bad_kerning: [[int, int]] = list(sheet.iter_races_with_kerning())
+        print(f"{races_with_bad_kerning=}")
+        races_without_bad_kerning: [[int, int]] = [sheet.kerned_race]
+        print(f"{races_without_bad_kerning=}")
 
-    margin_of_error_with_bad_kerning: int = calculate_margin_of_error(
-        races_with_bad_kerning
-    )
-    margin_of_error_without_bad_kerning: int = calculate_margin_of_error(
-        races_without_bad_kerning
-    )
+        margin_of_error_with_bad_kerning: int = calculate_margin_of_error(
+            races_with_bad_kerning
+        )
+        margin_of_error_without_bad_kerning: int = calculate_margin_of_error(
+            races_without_bad_kerning
+        )
 
-    print(f"{margin_of_error_with_bad_kerning=}")
-    print(f"{margin_of_error_without_bad_kerning=}")
+        print(f"{margin_of_error_with_bad_kerning=}")
+        print(f"{margin_of_error_without_bad_kerning=}")
@@ -54,9 +54,46 @@ Find the rank of every hand in your set. What are the total winnings?
 
 from utils import utils
 from enum import IntEnum, auto
+from functools import cache
+from itertools import combinations_with_replacement, permutations, repeat
+from operator import lshift, or_
+from typing import Iterable
 
 CARD_MAP: str = dict(zip("23456789TJQKA", range(13)))
 CARD_MAP_WITH_WILDCARD: str = dict(zip("J23456789TQKA", range(13)))
+HAND_SIZE: int = 5
+# Every card value fits in one hexadecimal digit of a hand code
+CARD_BITS: int = 4
+HAND_CODE_BITS: int = CARD_BITS * HAND_SIZE
+# Not a hexadecimal digit, so int() rejects any hand holding a character that is not a card
+INVALID_CARD_CODE: str = "x"
+
+class HandCodeTable(dict):
+    """
+    A str.translate table from cards to hexadecimal digits.
+
+    Characters that are not cards are translated to INVALID_CARD_CODE instead of
+    being left as they are, where int() would read e.g. "a" or "1" as a card value.
+    """
+
+    def __missing__(self, character: int) -> str:
+        """
+        Translate a character that is not a card.
+
+        Args:
+            character (int): The code point of the character.
+
+        Returns:
+            str: INVALID_CARD_CODE.
+        """
+        return INVALID_CARD_CODE
+
+HAND_CODE_TABLE: HandCodeTable = HandCodeTable(
+    str.maketrans({card: f"{value:x}" for card, value in CARD_MAP.items()})
+)
+HAND_CODE_TABLE_WITH_WILDCARD: HandCodeTable = HandCodeTable(
+    str.maketrans({card: f"{value:x}" for card, value in CARD_MAP_WITH_WILDCARD.items()})
+)
 
 class HandRank(IntEnum):
     """
@@ -131,24 +168,17 @@ def get_hand_type(card_counts: [int]) -> HandRank:
 
     return hand_type
 
-def get_hand_rank(hand: str, wildcard = False) -> HandRank:
+def get_counts_rank(card_counts: [int], wildcard: bool = False) -> HandRank:
     """
-    Calculates the rank of a hand in a card game.
+    Calculates the rank of a hand from the counts of its cards.
 
     Args:
-        hand (str): The hand of cards represented as a string.
-        wildcard (bool, optional): Indicates whether a wildcard is present. Defaults to False.
+        card_counts (list[int]): The number of cards of each value in the hand.
+        wildcard (bool, optional): Indicates whether the cards of value 0 are wildcards. Defaults to False.
 
     Returns:
         HandRank: The rank of the hand.
-
     """
-    card_counts: [int] = [0] * 13
-
-    for card in hand:
-        card_value: int = get_card_value(card, wildcard)
-        card_counts[card_value] += 1
-
     rank: HandRank = get_hand_type(card_counts)
     
     if wildcard:
@@ -170,39 +200,181 @@ def get_hand_rank(hand: str, wildcard = False) -> HandRank:
 
     return rank
 
+def check_hand_sizes(hands: [str]) -> None:
+    """
+    Checks that every hand has HAND_SIZE cards, as the hand type table only covers those.
 
+    Args:
+        hands (list[str]): The hands of cards represented as strings.
 
-def sort_by_rank(hands: [tuple[str, int]], wildcard: bool = False):
+    Raises:
+        ValueError: If a hand has a different number of cards.
     """
-    Sorts a list of hands by their rank.
+    if any(map(HAND_SIZE.__ne__, map(len, hands))):
+        hand: str = next(hand for hand in hands if len(hand) != HAND_SIZE)
+        raise ValueError(f"A hand must have {HAND_SIZE} cards, got {hand!r}")
+
+def get_hand_code(hand: str, wildcard: bool = False) -> int:
+    """
+    Encodes a hand as an integer holding the value of each card in 4 bits, first card highest.
 
     Args:
-        hands (list[tuple[str, int]]): A list of tuples containing the hand and the bid.
+        hand (str): The hand of cards represented as a string.
+        wildcard (bool, optional): Indicates whether to use the wildcard card values. Defaults to False.
+
+    Returns:
+        int: The code of the hand, e.g. 0x3201c for "32T3K".
+
+    Raises:
+        ValueError: If the hand does not have HAND_SIZE cards, or holds a character that is not a card.
+    """
+    if len(hand) != HAND_SIZE:
+        raise ValueError(f"A hand must have {HAND_SIZE} cards, got {hand!r}")
+
+    try:
+        return int(hand.translate(HAND_CODE_TABLE_WITH_WILDCARD if wildcard else HAND_CODE_TABLE), 16)
+    except ValueError:
+        raise ValueError(f"Unknown card in hand {hand!r}") from None
+
+def get_hand_codes(hands: [str], wildcard: bool = False) -> [int]:
+    """
+    Encodes many hands with get_hand_code, translating and parsing them in bulk.
+
+    Args:
+        hands (list[str]): The hands of cards represented as strings.
+        wildcard (bool, optional): Indicates whether to use the wildcard card values. Defaults to False.
+
+    Returns:
+        list[int]: The code of each hand.
+
+    Raises:
+        ValueError: If a hand does not have HAND_SIZE cards, or holds a character that is not a card.
+    """
+    check_hand_sizes(hands)
+
+    code_table: HandCodeTable = HAND_CODE_TABLE_WITH_WILDCARD if wildcard else HAND_CODE_TABLE
+    try:
+        return list(map(int, map(str.translate, hands, repeat(code_table)), repeat(16)))
+    except ValueError:
+        # Encode the hands one by one to report the first invalid one
+        for hand in hands:
+            get_hand_code(hand, wildcard)
+        raise
+
+@cache
+def get_hand_type_table(wildcard: bool = False) -> bytes:
+    """
+    Builds the rank of every possible hand, indexed by hand code.
+
+    The rank only depends on which cards are in the hand, so it is computed once
+    per multiset of card values and written to every ordering of it. The table
+    is built on first use and shared afterwards, as immutable bytes so that no
+    caller can change the ranking for everyone else.
+
+    Args:
+        wildcard (bool, optional): Indicates whether the cards of value 0 are wildcards. Defaults to False.
+
+    Returns:
+        bytes: The HandRank value of each hand code, 0 for codes that are not hands.
+    """
+    num_cards: int = len(CARD_MAP)
+    table: bytearray = bytearray(1 << HAND_CODE_BITS)
+
+    for cards in combinations_with_replacement(range(num_cards), HAND_SIZE):
+        card_counts: [int] = [0] * num_cards
+        for card_value in cards:
+            card_counts[card_value] += 1
+
+        rank: HandRank = get_counts_rank(card_counts, wildcard)
+        for ordering in set(permutations(cards)):
+            code: int = 0
+            for card_value in ordering:
+                code = code << CARD_BITS | card_value
+            table[code] = rank
+
+    return bytes(table)
+
+def get_hand_rank(hand: str, wildcard = False) -> HandRank:
+    """
+    Calculates the rank of a hand in a card game.
+
+    The hand is encoded with get_hand_code and looked up in get_hand_type_table,
+    so every hand costs a single index.
+
+    Args:
+        hand (str): The hand of cards represented as a string.
+        wildcard (bool, optional): Indicates whether a wildcard is present. Defaults to False.
+
+    Returns:
+        HandRank: The rank of the hand.
+
+    Raises:
+        ValueError: If the hand does not have HAND_SIZE cards.
+
+    """
+    return HandRank(get_hand_type_table(wildcard)[get_hand_code(hand, wildcard)])
+
+def get_hand_ranks(hands: Iterable[str], wildcard: bool = False) -> bytes:
+    """
+    Calculates the ranks of many hands, one table index per hand.
+
+    Args:
+        hands (Iterable[str]): The hands of cards represented as strings.
+        wildcard (bool, optional): Indicates whether a wildcard is present. Defaults to False.
+
+    Returns:
+        bytes: The HandRank value of each hand.
+
+    Raises:
+        ValueError: If a hand does not have HAND_SIZE cards.
+    """
+    table: bytes = get_hand_type_table(wildcard)
+    return bytes(map(table.__getitem__, get_hand_codes(list(hands), wildcard)))
+
+
+
+def get_hand_sort_keys(hands: Iterable[str], wildcard: bool = False) -> [int]:
+    """
+    Encodes each hand as a single integer that orders hands the way the game does.
+
+    The rank of the hand sits above the HAND_CODE_BITS bits of its hand code, so
+    comparing two keys compares the ranks first and then the cards one by one.
+
+    Args:
+        hands (Iterable[str]): The hands of cards represented as strings.
         wildcard (bool, optional): Indicates whether wildcard is enabled. Defaults to False.
 
     Returns:
-        list[tuple[str, int]]: A sorted list of hands by their rank.
+        list[int]: The sort key of each hand.
 
+    Raises:
+        ValueError: If a hand does not have HAND_SIZE cards.
     """
-    hands_by_rank: [tuple[str, int]] = []
+    table: bytes = get_hand_type_table(wildcard)
+    codes: [int] = get_hand_codes(list(hands), wildcard)
+    return list(map(or_, map(lshift, map(table.__getitem__, codes), repeat(HAND_CODE_BITS)), codes))
 
-    def get_hand_order(hand_with_bid: tuple[str, int]):
-        """
-        Get the order of a hand with a bid.
+def sort_by_rank(hands: [tuple[str, int]], wildcard: bool = False):
+    """
+    Sorts a list of hands by their rank.
 
-        Args:
-            hand_with_bid (tuple[str, int]): A tuple containing the hand and the bid.
+    The position of each hand is packed below its sort key, so a plain sort of
+    integers orders the hands and keeps equal hands in their original order.
 
-        Returns:
-            tuple: A tuple containing the hand rank and the card values.
+    Args:
+        hands (list[tuple[str, int]]): A list of tuples containing the hand and the bid.
+        wildcard (bool, optional): Indicates whether wildcard is enabled. Defaults to False.
 
-        """
-        hand, _ = hand_with_bid
-        card_values: tuple[int] = tuple(get_card_value(card, wildcard) for card in hand)
+    Returns:
+        list[tuple[str, int]]: A sorted list of hands by their rank.
 
-        return (get_hand_rank(hand, wildcard), card_values)
-    
-    hands_by_rank = sorted(hands, key = get_hand_order)
+    """
+    index_bits: int = len(hands).bit_length()
+    index_mask: int = (1 << index_bits) - 1
+    sort_keys: [int] = get_hand_sort_keys((hand for hand, _ in hands), wildcard)
+
+    packed_keys: [int] = sorted(map(or_, map(lshift, sort_keys, repeat(index_bits)), range(len(hands))))
+    hands_by_rank: [tuple[str, int]] = [hands[packed_key & index_mask] for packed_key in packed_keys]
     return hands_by_rank
 
 def get_total_winnings(hands: [tuple[str, int]], wildcard: bool = False) -> int:
@@ -227,12 +399,12 @@ def get_total_winnings(hands: [tuple[str, int]], wildcard: bool = False) -> int:
     
     return total_winnings
 
-def parse_lines(lines: [str]):
+def parse_lines(lines: Iterable[str]):
     """
     Parse lines of input and return a list of tuples containing hands and bids.
 
     Args:
-        lines: A list of strings representing each line of input.
+        lines: An iterable of strings representing each line of input, e.g. utils.iter_lines.
 
     Returns:
         A list of tuples, where each tuple contains a hand and a bid.
@@ -253,7 +425,7 @@ def parse_lines(lines: [str]):
 
 if __name__ == "__main__":
     test = False
-    lines: [str] = utils.read_lines("day_7-data.txt", test = test)
+    lines: Iterable[str] = utils.iter_lines("day_7-data.txt", test = test)
 
     # lines = ["JKKK2 23", "QQQQ2 14"]
     plays: [tuple[str, int]] = parse_lines(lines)
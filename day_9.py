@@ -88,6 +88,7 @@ Analyze your OASIS report again, this time extrapolating the previous value for
 """
 
 from utils import utils
+from typing import Iterable
 
 def get_history(sequence: list[int]) -> list[list[int]]:
 
@@ -127,7 +128,7 @@ def extrapolate(history: list[list[int]], backwards: bool = False) -> int:
 
 
 
-def parse_lines(lines:list[str]) -> list[list[int]]:
+def parse_lines(lines: Iterable[str]) -> list[list[int]]:
     sequences: list[list[int]] = []
     for line in lines:
         sequences.append([int(num) for num in line.strip().split(' ')])
@@ -136,7 +137,7 @@ def parse_lines(lines:list[str]) -> list[list[int]]:
 
 if __name__ == "__main__":
     test: bool = False
-    lines: list[str] = utils.read_lines("day_9-data.txt", test = test)
+    lines: Iterable[str] = utils.iter_lines("day_9-data.txt", test = test)
     sequences: list[list[int]] = parse_lines(lines)
     # print(f"{sequences=}")
 
@@ -0,0 +1,194 @@
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+from concurrent.futures import CancelledError
+from threading import Event
+
+import pytest
+
+import day_5
+
+REPOSITORY_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_identity_range_is_kept():
+    source_map = day_5.SourceMap("seed-to-soil map:")
+    source_map.add_ranges("10 10 5")
+
+    assert source_map.source_ranges == [range(10, 15)]
+    assert source_map.destination_ranges == [range(10, 15)]
+    assert source_map.get_range_maps() == [(10, 15, 0)]
+    assert "[ 10,  14]--> [ 10,  14]" in repr(source_map)
+
+    restored = day_5.SourceMap.from_bytes(source_map.to_bytes())
+    assert restored.get_range_maps() == [(10, 15, 0)]
+
+
+def test_range_overlapping_identity_range_is_rejected():
+    source_map = day_5.SourceMap("seed-to-soil map:")
+    source_map.add_ranges("10 10 5")
+
+    with pytest.raises(ValueError):
+        source_map.add_ranges("30 11 2")
+    assert source_map[11] == 11
+
+
+def get_example_map():
+    source_map = day_5.SourceMap("seed-to-soil map:")
+    source_map.add_ranges("50 98 2")
+    source_map.add_ranges("52 50 48")
+    return source_map
+
+
+def test_cancel_before_start_runs_no_shard():
+    cancel_event = Event()
+    cancel_event.set()
+    progress_calls = []
+
+    with pytest.raises(CancelledError, match="after 0 of"):
+        day_5.get_min_location_parallel(
+            [79, 14, 55, 13],
+            get_example_map(),
+            num_workers=2,
+            progress=lambda *args: progress_calls.append(args),
+            cancel_event=cancel_event,
+        )
+    assert progress_calls == []
+
+
+def test_cancel_stops_submitting_shards():
+    cancel_event = Event()
+    progress_calls = []
+
+    def progress(finished, total):
+        progress_calls.append((finished, total))
+        cancel_event.set()
+
+    with pytest.raises(CancelledError):
+        day_5.get_min_location_parallel(
+            [0, 1000], get_example_map(), num_workers=1, num_shards=8, progress=progress, cancel_event=cancel_event
+        )
+    assert progress_calls == [(1, 8)]
+
+
+PARALLEL_SCRIPT = """
+import multiprocessing
+import day_5
+
+if __name__ == "__main__":
+    source_map = day_5.SourceMap("seed-to-soil map:")
+    source_map.add_ranges("50 98 2")
+    source_map.add_ranges("52 50 48")
+
+    context = multiprocessing.get_context({start_method!r})
+    print(day_5.get_min_location_parallel([79, 14, 55, 13], source_map, num_workers=2, mp_context=context))
+"""
+
+
+@pytest.mark.parametrize("start_method", multiprocessing.get_all_start_methods())
+def test_parallel_run_leaves_stderr_empty(start_method):
+    result = subprocess.run(
+        [sys.executable, "-c", PARALLEL_SCRIPT.format(start_method=start_method)],
+        cwd=REPOSITORY_PATH,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+    assert result.returncode == 0
+    assert result.stdout.strip() == "57"
+    assert result.stderr == ""
+
+
+STAGE_NAMES = ["seed", "soil", "fertilizer", "water", "light"]
+MAP_SIZE = 60
+
+
+def generate_bijective_rows(rng):
+    # Cut [0, MAP_SIZE) into blocks and lay the same blocks out again in a shuffled order
+    cuts = sorted(rng.sample(range(1, MAP_SIZE), rng.randint(0, 6)))
+    blocks = [(start, stop - start) for start, stop in zip([0] + cuts, cuts + [MAP_SIZE])]
+    shuffled_blocks = rng.sample(blocks, len(blocks))
+
+    rows = []
+    destination_start = 0
+    for source_start, length in shuffled_blocks:
+        rows.append((destination_start, source_start, length))
+        destination_start += length
+
+    return rows
+
+
+def get_brute_force_min_location(seeds, stages):
+    min_location = float("inf")
+    for start, length in zip(seeds[::2], seeds[1::2]):
+        for value in range(start, start + length):
+            for rows in stages:
+                for destination_start, source_start, row_length in rows:
+                    if source_start <= value < source_start + row_length:
+                        value += destination_start - source_start
+                        break
+            min_location = min(min_location, value)
+
+    return min_location
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_seed_range_strategies_match_brute_force(seed):
+    rng = random.Random(seed)
+    stages = [generate_bijective_rows(rng) for _ in STAGE_NAMES[1:]]
+    seeds = []
+    for _ in range(rng.randint(1, 4)):
+        seeds += [rng.randint(0, MAP_SIZE - 1), rng.randint(0, 10)]
+
+    source_map = None
+    for source_name, destination_name, rows in zip(STAGE_NAMES, STAGE_NAMES[1:], stages):
+        map_name = f"{source_name}-to-{destination_name} map:"
+        if source_map is None:
+            source_map = day_5.SourceMap(map_name)
+        else:
+            source_map.add_map(map_name)
+        for row in rows:
+            source_map.add_ranges(" ".join(map(str, row)))
+
+    expected = get_brute_force_min_location(seeds, stages)
+    for strategy in ("forward", "reverse", "auto"):
+        assert day_5.get_min_location(seeds, source_map, seed_ranges=True, strategy=strategy) == expected
+
+    single_seeds = seeds[::2]
+    assert day_5.get_min_location(single_seeds, source_map) == get_brute_force_min_location(
+        [value for seed in single_seeds for value in (seed, 1)], stages
+    )
+
+
+def test_empty_seed_range_is_ignored():
+    source_map = get_example_map()
+
+    for strategy in ("forward", "reverse"):
+        assert day_5.get_min_location([79, 14, 10, 0], source_map, seed_ranges=True, strategy=strategy) == 81
+
+
+@pytest.mark.parametrize(
+    "ranges_string, error",
+    [("0 -5 3", ValueError), ("0 5 -3", ValueError), (f"{1 << 64} 5 3", OverflowError)],
+)
+def test_invalid_range_leaves_map_untouched(ranges_string, error):
+    source_map = get_example_map()
+    columns = (source_map.source_starts[:], source_map.lengths[:], source_map.deltas[:], source_map.is_range[:])
+
+    with pytest.raises(error):
+        source_map.add_ranges(ranges_string)
+    assert (source_map.source_starts, source_map.lengths, source_map.deltas, source_map.is_range) == columns
+
+
+def test_map_from_buffer_is_read_only():
+    compiled_map = get_example_map().compile()
+    buffer = bytearray(compiled_map.get_buffer_size())
+    compiled_map.write_to_buffer(memoryview(buffer))
+    shared_map = day_5.PiecewiseMap.from_buffer(memoryview(buffer))
+
+    assert [shared_map[value] for value in (0, 50, 98, 100)] == [compiled_map[value] for value in (0, 50, 98, 100)]
+    with pytest.raises(TypeError):
+        shared_map.offsets[0] = 1
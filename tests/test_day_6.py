@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+import day_6
+
+
+def get_winning_hold_times(time, distance):
+    return [hold for hold in range(time + 1) if hold * (time - hold) > distance]
+
+
+def assert_bounds_match_brute_force(time, distance):
+    min_bound, max_bound = day_6.calculate_exact_displacement_bounds(time, distance)
+    winning_hold_times = get_winning_hold_times(time, distance)
+
+    assert max_bound - min_bound + 1 == len(winning_hold_times)
+    if winning_hold_times:
+        assert (min_bound, max_bound) == (winning_hold_times[0], winning_hold_times[-1])
+
+
+@pytest.mark.parametrize(
+    "time, distance",
+    [
+        (0, 0),
+        (0, -1),
+        # Zero discriminant: the record is exactly the best distance
+        (4, 4),
+        (10, 25),
+        # Negative discriminant: the record cannot be beaten
+        (4, 5),
+        (7, 13),
+        # Negative records are beaten by every hold time
+        (3, -5),
+        (1, 0),
+        (7, 9),
+        (15, 40),
+        (30, 200),
+    ],
+)
+def test_exact_bounds_edge_cases(time, distance):
+    assert_bounds_match_brute_force(time, distance)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_exact_bounds_match_brute_force(seed):
+    rng = random.Random(seed)
+    for _ in range(200):
+        time = rng.randint(0, 60)
+        distance = rng.randint(-10, time * time // 4 + 10)
+        assert_bounds_match_brute_force(time, distance)
+
+
+def test_race_sheets_read_both_ways_in_one_scan(tmp_path):
+    sheets = [
+        ["Time:      7  15   30", "Distance:  9  40  200"],
+        ["Time: 71530", "", "Distance:   940200"],
+    ]
+    (tmp_path / "races.txt").write_text("\n\n".join("\n".join(lines) for lines in sheets) + "\n")
+
+    for sheet, lines in zip(day_6.iter_race_sheets("races.txt", data_dir_path=str(tmp_path)), sheets):
+        assert list(sheet.iter_races_with_kerning()) == day_6.parse_lines([line for line in lines if line])
+        assert [sheet.kerned_race] == day_6.parse_lines([line for line in lines if line], adjusted_for_bad_kerning=True)
+
+
+def test_race_sheet_with_mismatched_columns_is_rejected(tmp_path):
+    (tmp_path / "races.txt").write_text("Time: 1 2\nDistance: 3\n")
+
+    with pytest.raises(ValueError):
+        for sheet in day_6.iter_race_sheets("races.txt", data_dir_path=str(tmp_path)):
+            list(sheet.iter_races_with_kerning())
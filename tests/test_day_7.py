@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+import day_7
+
+
+def get_counting_rank(hand, wildcard):
+    card_counts = [0] * len(day_7.CARD_MAP)
+    for card in hand:
+        card_counts[day_7.get_card_value(card, wildcard)] += 1
+
+    return day_7.get_counts_rank(card_counts, wildcard)
+
+
+@pytest.mark.parametrize("wildcard", [False, True])
+def test_hand_type_table_matches_counting(wildcard):
+    rng = random.Random(0)
+    hands = ["".join(rng.choices("23456789TJQKA", k=day_7.HAND_SIZE)) for _ in range(2000)]
+    hands += ["AAAAA", "JJJJJ", "JJJJ2", "2345J", "KK677", "KTJJT", "T55J5", "QQQJA"]
+
+    expected = [get_counting_rank(hand, wildcard) for hand in hands]
+    assert [day_7.get_hand_rank(hand, wildcard) for hand in hands] == expected
+    assert day_7.get_hand_ranks(hands, wildcard) == bytes(expected)
+
+
+def test_hand_type_table_is_immutable():
+    with pytest.raises(TypeError):
+        day_7.get_hand_type_table()[0] = 1
+
+
+@pytest.mark.parametrize("hand", ["", "AAAA", "AAAAAA"])
+def test_hand_with_wrong_size_is_rejected(hand):
+    with pytest.raises(ValueError, match="5 cards"):
+        day_7.get_hand_rank(hand)
+    with pytest.raises(ValueError, match="5 cards"):
+        day_7.get_hand_ranks(["AAAAA", hand])
+
+
+@pytest.mark.parametrize("hand", ["1AAAA", "aaaaa", "BBBBB", " AAAA", "A_AAA"])
+@pytest.mark.parametrize("wildcard", [False, True])
+def test_hand_with_unknown_card_is_rejected(hand, wildcard):
+    with pytest.raises(ValueError, match="Unknown card"):
+        day_7.get_hand_rank(hand, wildcard)
+    with pytest.raises(ValueError, match="Unknown card"):
+        day_7.get_hand_ranks(["AAAAA", hand], wildcard)
+    with pytest.raises(ValueError, match="Unknown card"):
+        day_7.sort_by_rank([("AAAA2", 1), (hand, 2)], wildcard)
@@ -1,8 +1,94 @@
-def read_lines(file_name: str, data_dir_path: str = "./data", test = False):
+import mmap
+from typing import Iterator
+
+
+def get_file_path(file_name: str, data_dir_path: str = "./data", test = False) -> str:
+    """
+    Builds the path of an input file inside the data directory.
+
+    Args:
+        file_name (str): The name of the input file.
+        data_dir_path (str, optional): The data directory. Defaults to "./data".
+        test (bool, optional): Whether to look in the test data directory. Defaults to False.
+
+    Returns:
+        str: The path of the input file.
+    """
     file_name = f"test/{file_name}" if test else file_name
-    file_path: str = f"{data_dir_path}/{file_name}"
-    
-    lines: [str] = []
+    return f"{data_dir_path}/{file_name}"
+
+
+def iter_lines(file_name: str, data_dir_path: str = "./data", test = False) -> Iterator[str]:
+    """
+    Lazily yields the stripped lines of an input file.
+
+    Only one line is held in memory at a time, so solvers that consume their
+    input in a single pass run in constant memory.
+
+    Args:
+        file_name (str): The name of the input file.
+        data_dir_path (str, optional): The data directory. Defaults to "./data".
+        test (bool, optional): Whether to read from the test data directory. Defaults to False.
+
+    Yields:
+        str: Each line of the file without its trailing newline and surrounding whitespace.
+    """
+    file_path: str = get_file_path(file_name, data_dir_path, test)
+
     with open(file_path, 'r') as f:
-        lines = [line.removesuffix('\n').strip() for line in f.readlines()]
+        for line in f:
+            yield line.removesuffix('\n').strip()
+
+
+def iter_line_buffers(file_name: str, data_dir_path: str = "./data", test = False) -> Iterator[memoryview]:
+    """
+    Lazily yields the raw bytes of each line of an input file as memoryview slices.
+
+    The file is memory-mapped, so no line is copied until the caller asks for it.
+    Each slice is released as soon as the next one is requested; callers that
+    need to keep a line around must copy it (e.g. with bytes()).
+
+    Args:
+        file_name (str): The name of the input file.
+        data_dir_path (str, optional): The data directory. Defaults to "./data".
+        test (bool, optional): Whether to read from the test data directory. Defaults to False.
+
+    Yields:
+        memoryview: The bytes of each line, without the line terminator.
+    """
+    file_path: str = get_file_path(file_name, data_dir_path, test)
+
+    with open(file_path, 'rb') as f:
+        # Empty files cannot be memory-mapped
+        if not f.seek(0, 2):
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            view: memoryview = memoryview(buffer)
+            size: int = len(buffer)
+            start: int = 0
+
+            try:
+                while start < size:
+                    end: int = buffer.find(b'\n', start)
+                    if end == -1:
+                        end = size
+
+                    stop: int = end
+                    if stop > start and buffer[stop - 1] == 0x0D:
+                        stop -= 1
+
+                    line: memoryview = view[start:stop]
+                    try:
+                        yield line
+                    finally:
+                        line.release()
+
+                    start = end + 1
+            finally:
+                view.release()
+
+
+def read_lines(file_name: str, data_dir_path: str = "./data", test = False):
+    lines: [str] = list(iter_lines(file_name, data_dir_path, test))
     return lines